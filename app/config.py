@@ -1,10 +1,11 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     # API Configuration
-    freecrypto_api_key: str
+    freecrypto_api_key: Optional[str] = None  # required for upstream calls, not to boot
     freecrypto_base_url: str = "https://api.freecryptoapi.com"
     
     # Application Settings
@@ -12,11 +13,34 @@ class Settings(BaseSettings):
     app_port: int = 8000
     app_env: str = "development"
     
+    # Logging
+    log_level: str = "INFO"
+    log_format: str = "json"  # json or text
+    log_sample_rate: float = 1.0  # fraction of sub-WARNING records kept
+    log_level_upstream: str = "INFO"
+    log_level_websocket: str = "INFO"
+    log_level_libraries: Optional[str] = None  # socketio/engineio/httpx: INFO in development, WARNING otherwise
+    
     # WebSocket Settings
     ws_poll_interval: int = 30  # seconds between polls
     
+    # Upstream resilience
+    upstream_timeout: float = 30.0  # seconds
+    circuit_failure_threshold: int = 5  # consecutive failures before opening
+    circuit_recovery_timeout: int = 30  # seconds before a half-open probe
+    
+    # Exchange index
+    exchange_index_refresh: int = 15  # seconds between snapshot refreshes
+    exchange_index_exchanges: List[str] = []  # warmed at startup; others are indexed on first query
+    
+    # Alerts
+    alerts_max_per_channel: int = 100  # pending alerts per Socket.IO client or channel
+    alerts_max_symbols: int = 200  # distinct symbols with pending alerts, all polled each tick
+    
     # Caching
     cache_ttl: int = 300  # seconds
+    cache_max_stale: int = 3600  # seconds expired entries remain as fallbacks
+    cache_max_entries: int = 10000  # least recently used entries are evicted beyond this
     
     class Config:
         env_file = ".env"
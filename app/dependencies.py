@@ -1,19 +1,27 @@
 from functools import lru_cache
+from typing import TYPE_CHECKING
 from app.config import Settings, get_settings
-from app.services.freecrypto_api import FreeCryptoAPIService
-from app.services.websocket_manager import WebSocketManager
 from app.repositories.crypto_repository import CryptoRepository
 from app.utils.cache import Cache
 
+# Heavy services (httpx, socketio) are imported by their factories on first
+# use, so importing the app does not pay for subsystems a process never touches.
+if TYPE_CHECKING:
+    from app.services.freecrypto_api import FreeCryptoAPIService
+    from app.services.websocket_manager import WebSocketManager
+    from app.services.exchange_index import ExchangeIndex
+    from app.services.alert_engine import AlertEngine
+
 @lru_cache()
-def get_api_service() -> FreeCryptoAPIService:
+def get_api_service() -> "FreeCryptoAPIService":
+    from app.services.freecrypto_api import FreeCryptoAPIService
     settings = get_settings()
     return FreeCryptoAPIService(settings)
 
 @lru_cache()
 def get_cache() -> Cache:
     settings = get_settings()
-    return Cache(settings.cache_ttl)
+    return Cache(settings.cache_ttl, settings.cache_max_stale, settings.cache_max_entries)
 
 @lru_cache()
 def get_crypto_repository() -> CryptoRepository:
@@ -22,5 +30,18 @@ def get_crypto_repository() -> CryptoRepository:
     return CryptoRepository(api_service, cache)
 
 @lru_cache()
-def get_websocket_manager() -> WebSocketManager:
-    return WebSocketManager()
\ No newline at end of file
+def get_websocket_manager() -> "WebSocketManager":
+    from app.services.websocket_manager import WebSocketManager
+    return WebSocketManager()
+
+@lru_cache()
+def get_exchange_index() -> "ExchangeIndex":
+    from app.services.exchange_index import ExchangeIndex
+    settings = get_settings()
+    return ExchangeIndex(get_crypto_repository(), settings.exchange_index_refresh, settings.exchange_index_exchanges)
+
+@lru_cache()
+def get_alert_engine() -> "AlertEngine":
+    from app.services.alert_engine import AlertEngine
+    settings = get_settings()
+    return AlertEngine(max_per_group=settings.alerts_max_per_channel, max_symbols=settings.alerts_max_symbols)
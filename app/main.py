@@ -1,16 +1,55 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-from app.config import get_settings
-from app.routers import market, exchange, conversion, historical, websocket
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import importlib
+import logging
+import time
+from app.config import Settings, get_settings
+from app.dependencies import get_exchange_index
+from app.routers import market, exchange, conversion, historical, alerts
+from app.utils.circuit_breaker import begin_stale_tracking
+from app.utils.lazy_asgi import LazyASGIApp
+from app.utils.logs import configure_logging
+from app.utils.metrics import registry, http_request_duration
+
+logger = logging.getLogger(__name__)
+
+async def run_background(settings: Settings):
+    """Poller and index refresh, started once the app is already serving"""
+    # Import socketio and httpx off the event loop so startup and the first
+    # requests are not blocked on them
+    websocket = await asyncio.to_thread(importlib.import_module, "app.routers.websocket")
+    await asyncio.to_thread(importlib.import_module, "app.services.freecrypto_api")
+    index = get_exchange_index()
+    for exchange in settings.exchange_index_exchanges:
+        index.schedule_refresh(exchange)
+    await asyncio.gather(index.run_refresh_loop(), websocket.broadcast_updates())
+
+def _background_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background tasks stopped", exc_info=task.exception())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(run_background(get_settings()))
+    task.add_done_callback(_background_done)
+    yield
+    if not task.done():  # a failed task was already reported by _background_done
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
 def create_app() -> FastAPI:
     settings = get_settings()
+    configure_logging(settings)
     
     app = FastAPI(
         title="Crypto Real-Time Monitoring Platform",
         description="FastAPI backend for FreeCryptoAPI with WebSocket support",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # CORS middleware
@@ -22,14 +61,38 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    @app.middleware("http")
+    async def record_latency(request: Request, call_next):
+        start = time.perf_counter()
+        status_code = 500
+        stale = begin_stale_tracking()
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            if stale:
+                # Served last-known-good data while upstream is failing
+                response.headers["X-Data-Stale"] = "true"
+                response.headers["X-Data-Age"] = str(int(stale["age"]))
+            return response
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = request.scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code)
+            )
+    
     # Include routers
     app.include_router(market.router)
     app.include_router(exchange.router)
     app.include_router(conversion.router)
     app.include_router(historical.router)
+    app.include_router(alerts.router)
     
-    # WebSocket
-    app.mount("/ws", websocket.socket_app)
+    # WebSocket; socketio is imported on the first connection or by the poller
+    app.mount("/ws", LazyASGIApp("app.routers.websocket:socket_app"))
     
     @app.get("/")
     async def root():
@@ -43,11 +106,21 @@ def create_app() -> FastAPI:
     async def health():
         return {"status": "healthy"}
     
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+    
     return app
 
-app = create_app()
+def __getattr__(name: str):
+    # "app.main:app" builds the app on first access rather than at import
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    import uvicorn
     settings = get_settings()
     uvicorn.run(
         "app.main:app",
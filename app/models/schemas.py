@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
+from enum import Enum
 
 
 # Common
@@ -9,6 +10,11 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class StreamFormat(str, Enum):
+    ndjson = "ndjson"
+    json = "json"
+
+
 # Market Data Schemas
 class CryptoPair(BaseModel):
     symbol: str
@@ -112,6 +118,30 @@ class ExchangePair(BaseModel):
 class ExchangeResponse(BaseModel):
     exchange: str
     pairs: Dict[str, ExchangePair]
+    next_cursor: Optional[str] = None
+
+
+class ExchangePairSort(str, Enum):
+    volume = "volume"
+    price = "price"
+    spread = "spread"
+    symbol = "symbol"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class BestQuoteResponse(BaseModel):
+    symbol: str
+    best_bid: Optional[float] = None
+    best_bid_exchange: Optional[str] = None
+    best_ask: Optional[float] = None
+    best_ask_exchange: Optional[str] = None
+    spread: Optional[float] = None
+    spread_pct: Optional[float] = None
+    exchanges: Dict[str, ExchangePair]
 
 
 # Conversion Schemas
@@ -155,11 +185,49 @@ class OHLCResponse(BaseModel):
 
 
 # WebSocket Schemas
+# Client-sent ticker, normalized to upper case; also used as a metrics label
+WSSymbol = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True, pattern=r"^\s*[A-Za-z0-9]{1,20}\s*$")]
+# Cap on a client's subscriptions, and so on the symbols in any one message
+MAX_SYMBOLS_PER_CLIENT = 100
+
+
 class WSSubscribe(BaseModel):
     action: str = "subscribe"
-    symbols: List[str]
+    symbols: List[WSSymbol] = Field(..., max_length=MAX_SYMBOLS_PER_CLIENT)
 
 
 class WSUnsubscribe(BaseModel):
     action: str = "unsubscribe"
-    symbols: List[str]
\ No newline at end of file
+    symbols: List[WSSymbol] = Field(..., max_length=MAX_SYMBOLS_PER_CLIENT)
+
+
+# Alert Schemas
+class AlertMetric(str, Enum):
+    price = "price"
+    change_24h = "change_24h"
+    rsi = "rsi"
+
+
+class AlertDirection(str, Enum):
+    above = "above"
+    below = "below"
+
+
+class AlertCreate(BaseModel):
+    symbol: str
+    metric: AlertMetric = AlertMetric.price
+    direction: AlertDirection
+    threshold: float
+    channel: Optional[str] = Field(None, description="Channel receiving alert_triggered; join it with alerts_join")
+
+
+class Alert(AlertCreate):
+    id: str
+    created_at: datetime
+    owner: Optional[str] = Field(None, exclude=True)  # sid of the Socket.IO client that created it
+
+
+class AlertTriggered(BaseModel):
+    alert: Alert
+    value: float
+    triggered_at: datetime
@@ -1,34 +1,98 @@
-from typing import Dict, List, Optional, Any
-from app.services.freecrypto_api import FreeCryptoAPIService
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Any, Tuple
 from app.config import Settings
 from app.utils.cache import Cache
+from app.utils.circuit_breaker import mark_stale
+from app.utils.metrics import cache_stale_served
+from fastapi import HTTPException
 import asyncio
 
+if TYPE_CHECKING:
+    # httpx is only needed once the first upstream call is made
+    from app.services.freecrypto_api import FreeCryptoAPIService
+
+# Per-endpoint cache TTLs (seconds), keyed by cache key family.
+# Reference data changes rarely, derived indicators every few minutes,
+# quotes every few seconds.
+CACHE_TTLS: Dict[str, int] = {
+    "crypto_list": 6 * 3600,
+    "crypto_data": 10,
+    "top_cryptos": 30,
+    "data_currency": 10,
+    "performance": 300,
+    "technical_analysis": 300,
+    "volatility": 300,
+    "breakouts": 300,
+    "ath_atl": 600,
+    "fear_greed": 900,
+    "exchange": 15,
+    "conversion": 10,
+    "history": 3600,
+    "timeframe": 3600,
+    "ohlc": 3600,
+}
+
+
+def _normalize(part: Any) -> str:
+    """Normalize a cache key part: case-fold strings, sort lists"""
+    if part is None:
+        return ""
+    if isinstance(part, (list, tuple, set)):
+        return ",".join(sorted({_normalize(p) for p in part}))
+    if isinstance(part, str):
+        return part.strip().upper()
+    return str(part)
+
+
+def make_cache_key(family: str, *parts: Any) -> str:
+    return ":".join([family, *(_normalize(p) for p in parts)])
+
+
 class CryptoRepository:
-    def __init__(self, api_service: FreeCryptoAPIService, cache: Cache):
+    def __init__(self, api_service: "FreeCryptoAPIService", cache: Cache):
         self.api = api_service
         self.cache = cache
-    
-    async def get_cached_crypto_data(self, symbols: List[str], currency: str = "USD") -> Dict[str, Any]:
-        cache_key = f"crypto_data:{','.join(sorted(symbols))}:{currency}"
+
+    async def _cached(self, family: str, parts: tuple, fetch) -> Any:
+        cache_key = make_cache_key(family, *parts)
         cached = self.cache.get(cache_key)
-        if cached:
+        if cached is not None:
             return cached
-        
-        data = await self.api.get_crypto_data(symbols, currency)
-        self.cache.set(cache_key, data)
+
+        try:
+            data = await fetch()
+        except HTTPException as e:
+            # Upstream down, rate limited or circuit open: serve last-known-good if we have it
+            stale = self.cache.get_stale(cache_key) if e.status_code >= 500 or e.status_code == 429 else None
+            if stale is None:
+                raise
+            value, age = stale
+            cache_stale_served.inc(family=family)
+            mark_stale(age)
+            return value
+        self.cache.set(cache_key, data, CACHE_TTLS.get(family))
         return data
-    
+
+    # Market Data
+    async def get_crypto_list(self) -> Dict[str, Any]:
+        return await self._cached("crypto_list", (), self.api.get_crypto_list)
+
+    async def get_cached_crypto_data(self, symbols: List[str], currency: str = "USD") -> Dict[str, Any]:
+        return await self._cached(
+            "crypto_data", (symbols, currency),
+            lambda: self.api.get_crypto_data(symbols, currency)
+        )
+
     async def get_top_cryptos_with_details(self, limit: int = 100, currency: str = "USD") -> List[Dict[str, Any]]:
-        cache_key = f"top_cryptos:{limit}:{currency}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return await self._cached(
+            "top_cryptos", (limit, currency),
+            lambda: self._fetch_top_cryptos_with_details(limit, currency)
+        )
+
+    async def _fetch_top_cryptos_with_details(self, limit: int, currency: str) -> List[Dict[str, Any]]:
         # Fetch top list and then get detailed data
         top_data = await self.api.get_top_cryptos(limit, currency)
         symbols = [item["symbol"] for item in top_data.get("data", [])[:10]]  # Limit for performance
-        
+
         if symbols:
             details = await self.get_cached_crypto_data(symbols, currency)
             # Merge data
@@ -38,12 +102,88 @@ class CryptoRepository:
                 if symbol in details.get("data", {}):
                     item.update(details["data"][symbol])
                 merged.append(item)
-            self.cache.set(cache_key, merged)
             return merged
-        
-        self.cache.set(cache_key, top_data.get("data", []))
+
         return top_data.get("data", [])
-    
+
+    async def get_data_currency(self, symbol: str, currency: str) -> Dict[str, Any]:
+        return await self._cached(
+            "data_currency", (symbol, currency),
+            lambda: self.api.get_data_currency(symbol, currency)
+        )
+
+    async def get_performance(self, symbol: str) -> Dict[str, Any]:
+        return await self._cached(
+            "performance", (symbol,), lambda: self.api.get_performance(symbol)
+        )
+
+    async def get_technical_analysis(self, symbol: str) -> Dict[str, Any]:
+        return await self._cached(
+            "technical_analysis", (symbol,), lambda: self.api.get_technical_analysis(symbol)
+        )
+
+    async def get_volatility(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        return await self._cached(
+            "volatility", (symbol,), lambda: self.api.get_volatility(symbol)
+        )
+
+    async def get_breakouts(self) -> Dict[str, Any]:
+        return await self._cached("breakouts", (), self.api.get_breakouts)
+
+    async def get_ath_atl(self, symbol: str) -> Dict[str, Any]:
+        return await self._cached(
+            "ath_atl", (symbol,), lambda: self.api.get_ath_atl(symbol)
+        )
+
+    async def get_fear_greed(self) -> Dict[str, Any]:
+        return await self._cached("fear_greed", (), self.api.get_fear_greed)
+
+    # Exchange Data
+    async def get_exchange_data(self, exchange: str, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self._cached(
+            "exchange", (exchange, symbols),
+            lambda: self.api.get_exchange_data(exchange, symbols)
+        )
+
+    async def fetch_exchange_data(self, exchange: str) -> Dict[str, Any]:
+        """Uncached and never stale: for callers that record their own refresh time"""
+        return await self.api.get_exchange_data(exchange)
+
+    def stream_exchange_pairs(self, exchange: str, symbols: Optional[List[str]] = None) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """Uncached: streams straight from upstream to keep memory per request bounded"""
+        return self.api.stream_exchange_pairs(exchange, symbols)
+
+    # Conversion
+    async def get_conversion(self, from_symbol: str, to_symbol: str, amount: float = 1.0) -> Dict[str, Any]:
+        # Cached per pair at amount 1, so arbitrary amounts share one entry
+        unit = await self._cached(
+            "conversion", (from_symbol, to_symbol),
+            lambda: self.api.get_conversion(from_symbol, to_symbol, 1.0)
+        )
+        if unit.get("rate") is None:
+            return await self.api.get_conversion(from_symbol, to_symbol, amount)
+        return {**unit, "amount": amount, "result": unit["rate"] * amount}
+
+    async def get_history(self, symbol: str, days: int = 30) -> Dict[str, Any]:
+        return await self._cached(
+            "history", (symbol, days), lambda: self.api.get_history(symbol, days)
+        )
+
+    async def get_timeframe(self, symbol: str, start_date: str, end_date: str) -> Dict[str, Any]:
+        return await self._cached(
+            "timeframe", (symbol, start_date, end_date),
+            lambda: self.api.get_timeframe(symbol, start_date, end_date)
+        )
+
+    def stream_timeframe(self, symbol: str, start_date: str, end_date: str) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """Uncached: streams straight from upstream to keep memory per request bounded"""
+        return self.api.stream_timeframe(symbol, start_date, end_date)
+
+    async def get_ohlc(self, symbol: str, days: int = 30) -> Dict[str, Any]:
+        return await self._cached(
+            "ohlc", (symbol, days), lambda: self.api.get_ohlc(symbol, days)
+        )
+
     async def get_real_time_update(self, symbols: List[str]) -> Dict[str, Any]:
         """Fetch real-time update for WebSocket broadcasting"""
-        return await self.api.get_crypto_data(symbols)
\ No newline at end of file
+        return await self.api.get_crypto_data(symbols)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from app.services.alert_engine import AlertEngine
+from app.models.schemas import Alert, AlertCreate, AlertTriggered
+from app.dependencies import get_alert_engine
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"])
+
+@router.post("", response_model=Alert, status_code=201)
+async def create_alert(
+    request: AlertCreate,
+    engine: AlertEngine = Depends(get_alert_engine)
+):
+    """Create a one-shot alert; join its channel over Socket.IO (alerts_join) to receive alert_triggered"""
+    return engine.create(request)
+
+@router.get("", response_model=List[Alert])
+async def list_alerts(
+    channel: Optional[str] = Query(None, description="Only alerts for this channel"),
+    engine: AlertEngine = Depends(get_alert_engine)
+):
+    """List pending alerts"""
+    return engine.list_alerts(channel)
+
+@router.get("/triggered", response_model=List[AlertTriggered])
+async def get_triggered_alerts(
+    channel: Optional[str] = Query(None, description="Only alerts for this channel"),
+    limit: int = Query(100, ge=1, le=1000),
+    engine: AlertEngine = Depends(get_alert_engine)
+):
+    """Recently triggered alerts, newest first"""
+    return engine.recent(channel, limit)
+
+@router.delete("/{alert_id}", response_model=Alert)
+async def delete_alert(
+    alert_id: str,
+    engine: AlertEngine = Depends(get_alert_engine)
+):
+    """Cancel a pending alert"""
+    alert = engine.delete(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return alert
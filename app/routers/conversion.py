@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query
-from app.services.freecrypto_api import FreeCryptoAPIService
+from app.repositories.crypto_repository import CryptoRepository
 from app.models.schemas import ConversionResponse
-from app.dependencies import get_api_service
+from app.dependencies import get_crypto_repository
 
 router = APIRouter(prefix="/conversion", tags=["Conversion"])
 
@@ -10,7 +10,7 @@ async def convert_crypto(
     from_symbol: str = Query(..., description="From symbol"),
     to_symbol: str = Query(..., description="To symbol"),
     amount: float = Query(1.0, description="Amount to convert"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Convert between any 2 crypto currencies"""
-    return await api.get_conversion(from_symbol, to_symbol, amount)
\ No newline at end of file
+    return await repo.get_conversion(from_symbol, to_symbol, amount)
\ No newline at end of file
@@ -1,16 +1,105 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List, Optional
-from app.services.freecrypto_api import FreeCryptoAPIService
-from app.models.schemas import ExchangeResponse, ExchangeDataRequest
-from app.dependencies import get_api_service
+from fastapi import APIRouter, Depends, HTTPException, Query
+from itertools import islice
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from app.repositories.crypto_repository import CryptoRepository
+from app.services.exchange_index import ExchangeIndex, quote_asset
+from app.models.schemas import (
+    ExchangeResponse, ExchangeDataRequest, ExchangePair, StreamFormat,
+    ExchangePairSort, SortOrder, BestQuoteResponse
+)
+from app.dependencies import get_crypto_repository, get_exchange_index
+from app.utils.streaming import decode_cursor, encode_cursor, prime, stream_records
 
 router = APIRouter(prefix="/exchange", tags=["Exchange Data"])
 
+def _cursor_position(cursor: Optional[str], sort: ExchangePairSort) -> Optional[Tuple[Any, str]]:
+    """(sort value, pair name) a page resumes after, validated so it compares with the snapshot's keys"""
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    if len(position) != 3 or position[0] != sort.value:
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort")
+    _, value, name = position
+    value_type = str if sort == ExchangePairSort.symbol else (int, float)
+    if not isinstance(value, value_type) or isinstance(value, bool) or not isinstance(name, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, name
+
+async def _filtered_records(pairs: AsyncIterator[Tuple[Optional[str], Any]], quote: Optional[str],
+                            min_volume: Optional[float]) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    """Validate streamed pairs and apply the quote/min_volume filters as they arrive"""
+    wanted_quote = quote.upper() if quote else None
+    async for name, raw in pairs:
+        pair = ExchangePair.model_validate(raw)
+        if wanted_quote and quote_asset(name) != wanted_quote:
+            continue
+        if min_volume is not None and pair.volume < min_volume:
+            continue
+        yield name, pair.model_dump()
+
 @router.get("/data", response_model=ExchangeResponse)
 async def get_exchange_data(
     exchange: str = Query(..., description="Exchange name (e.g., binance, coinbase)"),
     symbols: Optional[List[str]] = Query(None, description="Optional list of symbols"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    quote: Optional[str] = Query(None, description="Only pairs quoted in this asset (e.g., USDT)"),
+    min_volume: Optional[float] = Query(None, ge=0, description="Only pairs with at least this volume"),
+    sort: Optional[ExchangePairSort] = Query(None, description="Sort pairs by this key"),
+    order: SortOrder = Query(SortOrder.desc, description="Sort direction"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size for pairs"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream pairs as ndjson or chunked json; filters apply, sorting and paging do not"),
+    repo: CryptoRepository = Depends(get_crypto_repository),
+    index: ExchangeIndex = Depends(get_exchange_index)
 ):
     """Get all pairs and their latest data on a specific exchange"""
-    return await api.get_exchange_data(exchange, symbols)
\ No newline at end of file
+    if stream:
+        if sort or limit is not None or cursor is not None:
+            raise HTTPException(status_code=400, detail="sort, limit and cursor cannot be combined with stream")
+        pairs = await prime(repo.stream_exchange_pairs(exchange, symbols))
+        return stream_records(
+            _filtered_records(pairs, quote, min_volume), stream.value, {"exchange": exchange}, "pairs", keyed=True
+        )
+    
+    paging = limit is not None or cursor is not None
+    filtering = quote or min_volume is not None
+    if not (paging or filtering or sort):
+        return await repo.get_exchange_data(exchange, symbols)
+    
+    # Filter, sort and page server-side from the per-exchange snapshot index.
+    # Unsorted pages go by pair name; cursors carry the last pair's sort key so
+    # a page resumes after it, even once the snapshot has been refreshed.
+    if sort is None and not filtering:
+        sort_by, descending = ExchangePairSort.symbol, False
+    else:
+        sort_by, descending = sort or ExchangePairSort.volume, order == SortOrder.desc
+    after = _cursor_position(cursor, sort_by)
+    page_size = limit or 1000
+    
+    snapshot = await index.snapshot(exchange)
+    pairs = snapshot.query(
+        quote=quote,
+        min_volume=min_volume,
+        sort=sort_by.value,
+        descending=descending,
+        # one extra pair tells us whether another page exists
+        limit=page_size + 1 if paging else None,
+        symbols=symbols,
+        after=after,
+    )
+    if not paging:
+        return {"exchange": exchange, "pairs": pairs}
+    
+    page = dict(islice(pairs.items(), page_size))
+    next_cursor = None
+    if len(pairs) > page_size:
+        next_cursor = encode_cursor([sort_by.value, *snapshot.sort_key(next(reversed(page)), sort_by.value)])
+    return {"exchange": exchange, "pairs": page, "next_cursor": next_cursor}
+
+@router.get("/best-quote", response_model=BestQuoteResponse)
+async def get_best_quote(
+    symbol: str = Query(..., description="Pair symbol (e.g., BTCUSDT or BTC/USDT)"),
+    exchanges: Optional[List[str]] = Query(None, description="Exchanges to compare; defaults to all indexed"),
+    index: ExchangeIndex = Depends(get_exchange_index)
+):
+    """Best bid/ask and spread for a pair across exchanges"""
+    return await index.best_quote(symbol, exchanges)
@@ -1,27 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List
-from app.services.freecrypto_api import FreeCryptoAPIService
 from app.repositories.crypto_repository import CryptoRepository
 from app.models.schemas import *
 from app.config import get_settings
-from app.dependencies import get_api_service, get_crypto_repository
+from app.dependencies import get_crypto_repository
 
 router = APIRouter(prefix="/market", tags=["Market Data"])
 
 @router.get("/list", response_model=CryptoListResponse)
 async def get_crypto_list(
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get list of supported crypto currencies and pairs"""
-    return await api.get_crypto_list()
+    return await repo.get_crypto_list()
 
 @router.post("/data", response_model=CryptoDataResponse)
 async def get_crypto_data(
     request: CryptoDataRequest,
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get single or multiple crypto currency data"""
-    return await api.get_crypto_data(request.symbols, request.currency)
+    return await repo.get_cached_crypto_data(request.symbols, request.currency)
 
 @router.get("/top", response_model=List[TopCryptoResponse])
 async def get_top_cryptos(
@@ -35,18 +34,18 @@ async def get_top_cryptos(
 @router.get("/performance", response_model=PerformanceResponse)
 async def get_performance(
     symbol: str = Query(..., description="Crypto symbol"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get performance change percentages for a symbol"""
-    return await api.get_performance(symbol)
+    return await repo.get_performance(symbol)
 
 @router.get("/technical-analysis", response_model=TechnicalAnalysisResponse)
 async def get_technical_analysis(
     symbol: str = Query(..., description="Crypto symbol"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get technical analysis (MACD, signal line, RSI) for a symbol"""
-    data = await api.get_technical_analysis(symbol)
+    data = await repo.get_technical_analysis(symbol)
     # Transform data to match schema
     return {
         "symbol": symbol,
@@ -59,10 +58,10 @@ async def get_technical_analysis(
 @router.get("/volatility", response_model=VolatilityResponse)
 async def get_volatility(
     symbol: Optional[str] = Query(None, description="Crypto symbol or none for top coins"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get volatility (standard deviation of price)"""
-    data = await api.get_volatility(symbol)
+    data = await repo.get_volatility(symbol)
     return {
         "symbol": symbol or "top",
         "volatility": data.get("volatility", 0),
@@ -71,10 +70,10 @@ async def get_volatility(
 
 @router.get("/breakouts", response_model=List[BreakoutResponse])
 async def get_breakouts(
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get 20/50/200-SMA breakout signals"""
-    data = await api.get_breakouts()
+    data = await repo.get_breakouts()
     # Transform to list format
     breakouts = []
     for symbol, signals in data.get("breakouts", {}).items():
@@ -91,17 +90,17 @@ async def get_breakouts(
 @router.get("/ath-atl", response_model=ATHATLResponse)
 async def get_ath_atl(
     symbol: str = Query(..., description="Crypto symbol"),
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get all-time high/low, dates, distance from ATH, multipliers"""
-    return await api.get_ath_atl(symbol)
+    return await repo.get_ath_atl(symbol)
 
 @router.get("/fear-greed", response_model=FearGreedResponse)
 async def get_fear_greed(
-    api: FreeCryptoAPIService = Depends(get_api_service)
+    repo: CryptoRepository = Depends(get_crypto_repository)
 ):
     """Get Fear & Greed Index"""
-    data = await api.get_fear_greed()
+    data = await repo.get_fear_greed()
     return {
         "value": data.get("value", 50),
         "classification": data.get("classification", "Neutral"),
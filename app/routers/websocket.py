@@ -1,19 +1,27 @@
 import socketio
 from fastapi import APIRouter, Depends
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Set
 import asyncio
+import logging
+import time
 from app.services.websocket_manager import WebSocketManager
 from app.dependencies import get_websocket_manager
-from app.models.schemas import WSSubscribe, WSUnsubscribe
+from app.models.schemas import MAX_SYMBOLS_PER_CLIENT, WSSubscribe, WSUnsubscribe, AlertCreate
+from app.utils.compact_encoding import COMPACT_FIELDS, pack_row, pack_update
+from app.utils.metrics import (
+    ws_broadcast_duration, ws_emits, ws_connected_clients, ws_symbol_subscriptions
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["WebSocket"])
 
-# Create Socket.IO server
+# Create Socket.IO server; verbosity of its loggers is set by configure_logging
 sio = socketio.AsyncServer(
     async_mode="asgi",
     cors_allowed_origins="*",
-    logger=True,
-    engineio_logger=True
+    logger=logging.getLogger("socketio"),
+    engineio_logger=logging.getLogger("engineio")
 )
 
 # Wrap with ASGI application
@@ -21,82 +29,182 @@ socket_app = socketio.ASGIApp(sio)
 
 # Store active connections and subscriptions
 active_connections: Dict[str, Set[str]] = {}  # sid -> set of symbols
+client_encodings: Dict[str, str] = {}  # sid -> "msgpack"; absent means JSON
+
+ENCODINGS = ("json", "msgpack")
+
+def alert_room(channel: str) -> str:
+    """Room for an alert channel, kept apart from the per-sid rooms Socket.IO creates"""
+    return f"alerts:{channel}"
+
+async def emit(event: str, data: Any, room: str):
+    """Emit to a client and count it"""
+    ws_emits.inc(event=event)
+    await sio.emit(event, data, room=room)
 
 @sio.event
 async def connect(sid, environ, auth):
-    """Handle client connection"""
-    print(f"Client connected: {sid}")
+    """Handle client connection; auth may carry {"encoding": "msgpack"} for binary updates"""
+    logger.debug("Client connected: %s", sid)
     active_connections[sid] = set()
-    await sio.emit("connected", {"message": "Connected to crypto stream"}, room=sid)
+    ws_connected_clients.set(len(active_connections))
+    from app.dependencies import get_alert_engine
+    get_alert_engine().open_session(sid)
+    
+    encoding = auth.get("encoding", "json") if isinstance(auth, dict) else "json"
+    if encoding not in ENCODINGS:
+        encoding = "json"
+    message = {"message": "Connected to crypto stream", "encoding": encoding}
+    if encoding == "msgpack":
+        client_encodings[sid] = encoding
+        # crypto_update then arrives as binary ["update", [[symbol, price, ...], ...]]
+        message["fields"] = list(COMPACT_FIELDS)
+    await emit("connected", message, room=sid)
 
 @sio.event
 async def disconnect(sid):
     """Handle client disconnection"""
-    print(f"Client disconnected: {sid}")
+    logger.debug("Client disconnected: %s", sid)
+    client_encodings.pop(sid, None)
+    from app.dependencies import get_alert_engine
+    get_alert_engine().close_session(sid)
     if sid in active_connections:
-        del active_connections[sid]
+        for symbol in active_connections.pop(sid):
+            ws_symbol_subscriptions.dec(symbol=symbol)
+    ws_connected_clients.set(len(active_connections))
 
 @sio.event
 async def subscribe(sid, data: Dict):
     """Subscribe to crypto symbols"""
     try:
-        symbols = data.get("symbols", [])
+        symbols = set(WSSubscribe(**data).symbols)
         if not symbols:
-            await sio.emit("error", {"message": "No symbols provided"}, room=sid)
+            await emit("error", {"message": "No symbols provided"}, room=sid)
             return
         
         if sid not in active_connections:
             active_connections[sid] = set()
         
-        active_connections[sid].update(symbols)
-        await sio.emit("subscribed", {"symbols": list(active_connections[sid])}, room=sid)
-        print(f"Client {sid} subscribed to: {symbols}")
+        added = symbols - active_connections[sid]
+        if len(active_connections[sid]) + len(added) > MAX_SYMBOLS_PER_CLIENT:
+            await emit("error", {"message": f"At most {MAX_SYMBOLS_PER_CLIENT} symbols per client"}, room=sid)
+            return
+        for symbol in added:
+            ws_symbol_subscriptions.inc(symbol=symbol)
+        active_connections[sid].update(added)
+        await emit("subscribed", {"symbols": list(active_connections[sid])}, room=sid)
+        logger.debug("Client %s subscribed to: %s", sid, added)
     except Exception as e:
-        await sio.emit("error", {"message": str(e)}, room=sid)
+        await emit("error", {"message": str(e)}, room=sid)
 
 @sio.event
 async def unsubscribe(sid, data: Dict):
     """Unsubscribe from crypto symbols"""
     try:
-        symbols = data.get("symbols", [])
+        symbols = WSUnsubscribe(**data).symbols
         if sid in active_connections:
+            for symbol in active_connections[sid].intersection(symbols):
+                ws_symbol_subscriptions.dec(symbol=symbol)
             active_connections[sid].difference_update(symbols)
-            await sio.emit("unsubscribed", {"symbols": list(active_connections[sid])}, room=sid)
-            print(f"Client {sid} unsubscribed from: {symbols}")
+            await emit("unsubscribed", {"symbols": list(active_connections[sid])}, room=sid)
+            logger.debug("Client %s unsubscribed from: %s", sid, symbols)
+    except Exception as e:
+        await emit("error", {"message": str(e)}, room=sid)
+
+@sio.event
+async def create_alert(sid, data: Dict):
+    """Create an alert delivered to this client, or to data["channel"], as alert_triggered"""
+    from app.dependencies import get_alert_engine
+    try:
+        alert = get_alert_engine().create(AlertCreate(**data), owner=sid)
+        await emit("alert_created", alert.model_dump(mode="json"), room=sid)
+    except Exception as e:
+        await emit("error", {"message": str(e)}, room=sid)
+
+@sio.event
+async def delete_alert(sid, data: Dict):
+    """Cancel a pending alert"""
+    from app.dependencies import get_alert_engine
+    try:
+        alert = get_alert_engine().delete(data.get("id", ""))
+        if alert is None:
+            await emit("error", {"message": "Alert not found"}, room=sid)
+            return
+        await emit("alert_deleted", {"id": alert.id}, room=sid)
     except Exception as e:
-        await sio.emit("error", {"message": str(e)}, room=sid)
+        await emit("error", {"message": str(e)}, room=sid)
+
+@sio.event
+async def alerts_join(sid, data: Dict):
+    """Receive alert_triggered for a channel, e.g. one used by REST-created alerts"""
+    try:
+        channel = data.get("channel")
+        if not channel or not isinstance(channel, str):
+            await emit("error", {"message": "No channel provided"}, room=sid)
+            return
+        if channel in active_connections:
+            # Would otherwise receive another client's per-sid events
+            await emit("error", {"message": "Channel name is reserved"}, room=sid)
+            return
+        await sio.enter_room(sid, alert_room(channel))
+        await emit("alerts_joined", {"channel": channel}, room=sid)
+    except Exception as e:
+        await emit("error", {"message": str(e)}, room=sid)
+
+async def broadcast_tick(repo, alerts=None):
+    """Fetch all subscribed symbols once, push each client its slice, then evaluate alerts"""
+    tick_start = time.perf_counter()
+    # Get all subscribed symbols across all clients, plus those with pending alerts
+    all_symbols = alerts.symbols() if alerts else set()
+    for symbols in active_connections.values():
+        all_symbols.update(symbols)
+    
+    if not all_symbols:
+        return
+    
+    # Fetch data for all subscribed symbols
+    data = await repo.get_real_time_update(list(all_symbols))
+    
+    updates = data.get("data", {})
+    packed_rows: Dict[str, bytes] = {}  # each symbol packed once per tick, shared by binary clients
+    
+    # Broadcast to all clients with their subscribed symbols
+    for sid, symbols in list(active_connections.items()):
+        if not symbols:
+            continue
+        if client_encodings.get(sid) == "msgpack":
+            rows = []
+            for symbol in symbols:
+                row = packed_rows.get(symbol)
+                if row is None:
+                    row = packed_rows[symbol] = pack_row(symbol, updates.get(symbol))
+                rows.append(row)
+            await emit("crypto_update", pack_update(rows, len(rows)), room=sid)
+        else:
+            client_data = {
+                "type": "update",
+                "data": {symbol: updates.get(symbol) for symbol in symbols}
+            }
+            await emit("crypto_update", client_data, room=sid)
+    
+    if alerts:
+        for triggered in await alerts.evaluate_tick(updates, repo):
+            alert = triggered.alert
+            room = alert_room(alert.channel) if alert.channel else alert.owner
+            if room:
+                await emit("alert_triggered", triggered.model_dump(mode="json"), room=room)
+    ws_broadcast_duration.observe(time.perf_counter() - tick_start)
 
 async def broadcast_updates():
-    """Background task to broadcast real-time updates"""
-    from app.dependencies import get_crypto_repository
+    """Background task to broadcast real-time updates; started from the app lifespan"""
+    from app.config import get_settings
+    from app.dependencies import get_crypto_repository, get_alert_engine
     
+    interval = get_settings().ws_poll_interval
     while True:
         try:
-            # Get all subscribed symbols across all clients
-            all_symbols = set()
-            for symbols in active_connections.values():
-                all_symbols.update(symbols)
-            
-            if all_symbols:
-                # Fetch data for all subscribed symbols
-                repo = get_crypto_repository()
-                data = await repo.get_real_time_update(list(all_symbols))
-                
-                # Broadcast to all clients with their subscribed symbols
-                for sid, symbols in active_connections.items():
-                    if symbols:
-                        client_data = {
-                            "type": "update",
-                            "data": {symbol: data.get("data", {}).get(symbol) for symbol in symbols}
-                        }
-                        await sio.emit("crypto_update", client_data, room=sid)
-            
-            await asyncio.sleep(30)  # Configurable poll interval
+            await broadcast_tick(get_crypto_repository(), get_alert_engine())
+            await asyncio.sleep(interval)
         except Exception as e:
-            print(f"Error in broadcast task: {e}")
-            await asyncio.sleep(30)
-
-# Start broadcast task on startup
-@sio.event
-async def startup():
-    asyncio.create_task(broadcast_updates())
\ No newline at end of file
+            logger.warning("Error in broadcast task: %s", e)
+            await asyncio.sleep(interval)
\ No newline at end of file
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException, status
+from app.models.schemas import Alert, AlertCreate, AlertDirection, AlertMetric, AlertTriggered
+
+logger = logging.getLogger(__name__)
+
+IndexKey = Tuple[str, AlertMetric, AlertDirection]
+GroupKey = Tuple[str, Optional[str]]  # ("owner", sid) or ("channel", name); ("channel", None) is REST without one
+
+
+class _ThresholdBook:
+    """Alerts of one (symbol, metric, direction), firing when the value crosses their threshold.
+
+    Keys are thresholds signed so that "reached" always means key >= signed value
+    (negated for above). An alert is unarmed until the value is seen short of its
+    threshold, then armed until the value reaches it. Armed keys ascend and unarmed
+    keys are stored negated, also ascending, so firing and arming both take a
+    suffix; each alert is inserted at most twice over its life.
+    """
+
+    def __init__(self, direction: AlertDirection):
+        self.sign = -1.0 if direction == AlertDirection.above else 1.0
+        self.armed_keys: List[float] = []
+        self.armed_ids: List[str] = []
+        self.unarmed_keys: List[float] = []  # negated keys
+        self.unarmed_ids: List[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.armed_ids or self.unarmed_ids)
+
+    def add(self, threshold: float, alert_id: str, last: Optional[float] = None):
+        """File an alert, armed if the last seen value is already short of its threshold"""
+        key = self.sign * threshold
+        if last is not None and key < self.sign * last:
+            _insert(self.armed_keys, self.armed_ids, key, alert_id)
+        else:
+            _insert(self.unarmed_keys, self.unarmed_ids, -key, alert_id)
+
+    def remove(self, threshold: float, alert_id: str):
+        key = self.sign * threshold
+        if not _remove(self.armed_keys, self.armed_ids, key, alert_id):
+            _remove(self.unarmed_keys, self.unarmed_ids, -key, alert_id)
+
+    def pop_fired(self, value: float) -> List[str]:
+        """Arm alerts the value is now short of; remove and return armed alerts it has reached"""
+        signed = self.sign * value
+        # Arming needs key < signed, firing key >= signed, so one value never does both
+        start = bisect_right(self.unarmed_keys, -signed)
+        for negated, alert_id in zip(self.unarmed_keys[start:], self.unarmed_ids[start:]):
+            _insert(self.armed_keys, self.armed_ids, -negated, alert_id)
+        del self.unarmed_keys[start:], self.unarmed_ids[start:]
+
+        start = bisect_left(self.armed_keys, signed)
+        fired = self.armed_ids[start:]
+        del self.armed_keys[start:], self.armed_ids[start:]
+        return fired
+
+
+def _insert(keys: List[float], ids: List[str], key: float, alert_id: str):
+    position = bisect_right(keys, key)
+    keys.insert(position, key)
+    ids.insert(position, alert_id)
+
+
+def _remove(keys: List[float], ids: List[str], key: float, alert_id: str) -> bool:
+    position = bisect_left(keys, key)
+    while position < len(ids) and keys[position] == key:
+        if ids[position] == alert_id:
+            del keys[position], ids[position]
+            return True
+        position += 1
+    return False
+
+
+class AlertEngine:
+    """One-shot alerts that fire when a value crosses their threshold, evaluated each poller tick.
+
+    An alert created while the value is already past its threshold waits for the
+    value to come back and cross again. Each tick costs O(log n + moved) per
+    (symbol, metric, direction) instead of a scan over every alert.
+    """
+
+    def __init__(self, history_size: int = 1000, max_per_group: int = 100, max_symbols: int = 200):
+        self.alerts: Dict[str, Alert] = {}
+        self._books: Dict[IndexKey, _ThresholdBook] = {}
+        self._symbols: Dict[str, int] = {}  # symbol -> live alert count
+        self._rsi_symbols: Dict[str, int] = {}
+        self._last: Dict[Tuple[str, AlertMetric], float] = {}  # last value seen, for alerted symbols only
+        self.triggered: Deque[AlertTriggered] = deque(maxlen=history_size)
+        self.sessions: Set[str] = set()  # connected Socket.IO sids, never usable as channels
+        self._groups: Dict[GroupKey, Dict[str, None]] = {}  # owner/channel -> alert ids, in creation order
+        # Every alerted symbol joins each tick's upstream fetch, so both are bounded
+        self.max_per_group = max_per_group
+        self.max_symbols = max_symbols
+
+    def open_session(self, sid: str):
+        self.sessions.add(sid)
+
+    def close_session(self, sid: str):
+        """Forget a disconnected client and drop the alerts it created"""
+        self.sessions.discard(sid)
+        for alert_id in list(self._groups.get(("owner", sid), ())):
+            self.delete(alert_id)
+
+    def create(self, request: AlertCreate, owner: Optional[str] = None) -> Alert:
+        if request.channel is not None and request.channel in self.sessions:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Channel name is reserved")
+        symbol = request.symbol.upper()
+        groups = self._group_keys(owner, request.channel)
+        if any(len(self._groups.get(key, ())) >= self.max_per_group for key in groups):
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Alert limit reached")
+        if symbol not in self._symbols and len(self._symbols) >= self.max_symbols:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Alerted symbol limit reached")
+        alert = Alert(
+            **request.model_dump(exclude={"symbol"}),
+            symbol=symbol,
+            owner=owner,
+            id=uuid.uuid4().hex,
+            created_at=datetime.now(),
+        )
+        self.alerts[alert.id] = alert
+        book = self._books.setdefault(self._key(alert), _ThresholdBook(alert.direction))
+        book.add(alert.threshold, alert.id, self._last.get((alert.symbol, alert.metric)))
+        self._track(alert, 1)
+        return alert
+
+    def delete(self, alert_id: str) -> Optional[Alert]:
+        alert = self.alerts.pop(alert_id, None)
+        if alert is not None:
+            self._books[self._key(alert)].remove(alert.threshold, alert.id)
+            self._track(alert, -1)
+        return alert
+
+    def list_alerts(self, channel: Optional[str] = None) -> List[Alert]:
+        if channel is None:
+            return list(self.alerts.values())
+        return [self.alerts[i] for i in self._groups.get(("channel", channel), ())]
+
+    def recent(self, channel: Optional[str] = None, limit: int = 100) -> List[AlertTriggered]:
+        matches = [t for t in reversed(self.triggered) if channel is None or t.alert.channel == channel]
+        return matches[:limit]
+
+    def symbols(self) -> Set[str]:
+        """Symbols the poller must fetch to evaluate alerts"""
+        return set(self._symbols)
+
+    def evaluate(self, values: Dict[str, Dict[AlertMetric, float]]) -> List[AlertTriggered]:
+        """Fire every alert crossed by ``{symbol: {metric: value}}``"""
+        fired: List[AlertTriggered] = []
+        now = datetime.now()
+        for symbol, metrics in values.items():
+            for metric, value in metrics.items():
+                if value is None:
+                    continue
+                if symbol in self._symbols:
+                    self._last[(symbol, metric)] = value
+                for direction in AlertDirection:
+                    book = self._books.get((symbol, metric, direction))
+                    if not book:
+                        continue
+                    for alert_id in book.pop_fired(value):
+                        alert = self.alerts.pop(alert_id)
+                        self._track(alert, -1)
+                        fired.append(AlertTriggered(alert=alert, value=value, triggered_at=now))
+        self.triggered.extend(fired)
+        return fired
+
+    async def evaluate_tick(self, updates: Dict[str, Any], repo) -> List[AlertTriggered]:
+        """Evaluate alerts against a poller tick's quotes, fetching RSI only where needed"""
+        values: Dict[str, Dict[AlertMetric, float]] = {}
+        for symbol in self._symbols:
+            quote = updates.get(symbol) or {}
+            values[symbol] = {
+                AlertMetric.price: quote.get("price"),
+                AlertMetric.change_24h: quote.get("change_24h"),
+            }
+
+        rsi_symbols = list(self._rsi_symbols)
+        if rsi_symbols:
+            results = await asyncio.gather(
+                *(repo.get_technical_analysis(symbol) for symbol in rsi_symbols), return_exceptions=True
+            )
+            for symbol, result in zip(rsi_symbols, results):
+                if isinstance(result, Exception):
+                    logger.warning("RSI unavailable for %s: %s", symbol, result)
+                    continue
+                values[symbol][AlertMetric.rsi] = result.get("rsi")
+
+        return self.evaluate(values)
+
+    @staticmethod
+    def _key(alert: Alert) -> IndexKey:
+        return alert.symbol, alert.metric, alert.direction
+
+    @staticmethod
+    def _group_keys(owner: Optional[str], channel: Optional[str]) -> List[GroupKey]:
+        keys: List[GroupKey] = [("owner", owner)] if owner else []
+        if channel or not owner:
+            keys.append(("channel", channel))
+        return keys
+
+    def _track(self, alert: Alert, delta: int):
+        for key in self._group_keys(alert.owner, alert.channel):
+            ids = self._groups.setdefault(key, {})
+            if delta > 0:
+                ids[alert.id] = None
+            else:
+                ids.pop(alert.id, None)
+                if not ids:
+                    del self._groups[key]
+        counters = [self._symbols]
+        if alert.metric == AlertMetric.rsi:
+            counters.append(self._rsi_symbols)
+        for counter in counters:
+            counter[alert.symbol] = counter.get(alert.symbol, 0) + delta
+            if counter[alert.symbol] <= 0:
+                del counter[alert.symbol]
+        if alert.symbol not in self._symbols:
+            for metric in AlertMetric:
+                self._last.pop((alert.symbol, metric), None)
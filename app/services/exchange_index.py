@@ -0,0 +1,236 @@
+import asyncio
+import functools
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.models.schemas import ExchangePair
+from app.repositories.crypto_repository import CryptoRepository
+
+logger = logging.getLogger(__name__)
+
+# Longest first so USDT wins over USD
+KNOWN_QUOTES: Tuple[str, ...] = tuple(sorted(
+    ("USDT", "USDC", "BUSD", "FDUSD", "TUSD", "DAI", "USD", "EUR", "GBP", "TRY", "BRL", "JPY",
+     "BTC", "ETH", "BNB"),
+    key=len, reverse=True
+))
+
+
+def normalize_symbol(symbol: str) -> str:
+    return symbol.replace("/", "").replace("-", "").replace("_", "").upper()
+
+
+def quote_asset(symbol: str) -> Optional[str]:
+    for sep in ("/", "-", "_"):
+        if sep in symbol:
+            return symbol.rsplit(sep, 1)[1].upper()
+    upper = symbol.upper()
+    for quote in KNOWN_QUOTES:
+        if upper.endswith(quote) and len(upper) > len(quote):
+            return quote
+    return None
+
+
+def base_asset(symbol: str) -> str:
+    for sep in ("/", "-", "_"):
+        if sep in symbol:
+            return symbol.rsplit(sep, 1)[0].upper()
+    upper = symbol.upper()
+    quote = quote_asset(upper)
+    return upper[:-len(quote)] if quote else upper
+
+
+def _spread(pair: ExchangePair) -> float:
+    if pair.bid is None or pair.ask is None:
+        return float("inf")
+    return pair.ask - pair.bid
+
+
+_SORT_VALUES = {
+    "volume": lambda name, pair: pair.volume,
+    "price": lambda name, pair: pair.price,
+    "spread": lambda name, pair: _spread(pair),
+    "symbol": lambda name, pair: name,
+}
+
+
+class ExchangeSnapshot:
+    """Immutable view of one exchange's pairs with pre-sorted orderings per quote asset"""
+
+    def __init__(self, exchange: str, pairs: Dict[str, ExchangePair]):
+        self.exchange = exchange
+        self.refreshed_at = time.monotonic()
+        self.pairs = pairs
+        self.by_symbol = {normalize_symbol(name): pair for name, pair in pairs.items()}
+        # What a requested symbol may match: the normalized pair name or its base asset
+        self._match_keys = {name: (normalize_symbol(name), base_asset(name)) for name in pairs}
+
+        groups: Dict[Optional[str], List[str]] = {None: list(pairs)}
+        for name in pairs:
+            groups.setdefault(quote_asset(name), []).append(name)
+
+        # (quote, sort key) -> names ascending by (value, name), plus those keys
+        # for bisecting; queries walk them forwards or backwards
+        self._orders: Dict[Tuple[Optional[str], str], List[str]] = {}
+        self._keys: Dict[Tuple[Optional[str], str], List[Tuple[Any, str]]] = {}
+        for quote, names in groups.items():
+            for sort in _SORT_VALUES:
+                keyed = sorted((self.sort_key(name, sort), name) for name in names)
+                self._keys[(quote, sort)] = [key for key, _ in keyed]
+                self._orders[(quote, sort)] = [name for _, name in keyed]
+
+    def sort_key(self, name: str, sort: str) -> Tuple[Any, str]:
+        """Position of a pair in a sort order; names break ties so positions are unique"""
+        return _SORT_VALUES[sort](name, self.pairs[name]), name
+
+    def query(self, quote: Optional[str] = None, min_volume: Optional[float] = None,
+              sort: str = "volume", descending: bool = True, limit: Optional[int] = None,
+              symbols: Optional[Iterable[str]] = None,
+              after: Optional[Tuple[Any, str]] = None) -> Dict[str, ExchangePair]:
+        """Pairs in sort order; ``symbols`` are base assets (BTC) or pair names (btc-usdt), as upstream.
+
+        ``after`` resumes strictly past a sort_key, which stays meaningful across
+        refreshes even if that pair has moved or gone.
+        """
+        order = (quote.upper() if quote else None, sort)
+        names = self._orders.get(order, [])
+        keys = self._keys.get(order, [])
+        if after is None:
+            ordered = reversed(names) if descending else iter(names)
+        elif descending:
+            start = bisect_left(keys, tuple(after))
+            ordered = (names[i] for i in range(start - 1, -1, -1))
+        else:
+            start = bisect_right(keys, tuple(after))
+            ordered = (names[i] for i in range(start, len(names)))
+        wanted = {normalize_symbol(symbol) for symbol in symbols} if symbols else None
+        result: Dict[str, ExchangePair] = {}
+        for name in ordered:
+            if wanted is not None and wanted.isdisjoint(self._match_keys[name]):
+                continue
+            pair = self.pairs[name]
+            if sort == "spread" and (pair.bid is None or pair.ask is None):
+                continue  # no spread to rank by
+            if min_volume is not None and pair.volume < min_volume:
+                if sort == "volume" and descending:
+                    break  # everything after is smaller
+                continue
+            result[name] = pair
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+
+class ExchangeIndex:
+    """Per-exchange in-memory snapshots of ExchangePair, refreshed from fetch_exchange_data"""
+
+    def __init__(self, repository: CryptoRepository, refresh_interval: int = 15,
+                 pinned: Iterable[str] = (), idle_intervals: int = 4):
+        self.repository = repository
+        self.refresh_interval = refresh_interval
+        self.snapshots: Dict[str, ExchangeSnapshot] = {}
+        # Configured exchanges are always kept fresh; any other exchange a client
+        # names is dropped once unqueried for idle_intervals refreshes
+        self.pinned = {exchange.lower() for exchange in pinned}
+        self.idle_timeout = refresh_interval * idle_intervals
+        self._last_used: Dict[str, float] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def refresh(self, exchange: str) -> ExchangeSnapshot:
+        key = exchange.lower()
+        # Straight from upstream: a last-known-good fallback would be stamped as fresh here
+        data = await self.repository.fetch_exchange_data(exchange)
+        pairs = {
+            name: ExchangePair.model_validate(pair)
+            for name, pair in data.get("pairs", {}).items()
+        }
+        snapshot = ExchangeSnapshot(key, pairs)
+        if key in self.pinned or key in self._last_used:
+            self.snapshots[key] = snapshot  # not evicted while the fetch was in flight
+        return snapshot
+
+    async def snapshot(self, exchange: str) -> ExchangeSnapshot:
+        """Current snapshot; fetched on first use, refreshed in the background once stale"""
+        key = exchange.lower()
+        self._last_used[key] = time.monotonic()
+        snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            return await self._refresh_once(key)
+        if time.monotonic() - snapshot.refreshed_at >= self.refresh_interval:
+            # Serve the current snapshot; one refresh per exchange in flight
+            self.schedule_refresh(key)
+        return snapshot
+
+    async def _refresh_once(self, exchange: str) -> ExchangeSnapshot:
+        task = self.schedule_refresh(exchange)
+        return await asyncio.shield(task)
+
+    def schedule_refresh(self, exchange: str) -> asyncio.Task:
+        task = self._refreshing.get(exchange)
+        if task is None or task.done():
+            task = self._refreshing[exchange] = asyncio.create_task(self.refresh(exchange))
+            task.add_done_callback(functools.partial(self._refresh_done, exchange))
+        return task
+
+    def _refresh_done(self, exchange: str, task: asyncio.Task):
+        # Finished tasks hold their snapshot; don't let them outlive an eviction
+        if self._refreshing.get(exchange) is task:
+            del self._refreshing[exchange]
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.warning("Exchange index refresh failed: %s", task.exception())
+        if exchange not in self.snapshots:
+            # Never indexed (e.g. an unknown exchange name); don't track it
+            self._last_used.pop(exchange, None)
+
+    async def best_quote(self, symbol: str, exchanges: Optional[List[str]] = None) -> Dict[str, Optional[object]]:
+        """Best bid/ask for a symbol across exchanges, and the resulting spread"""
+        wanted = normalize_symbol(symbol)
+        names = [e.lower() for e in exchanges] if exchanges else list(self.snapshots)
+        snapshots = await asyncio.gather(*(self.snapshot(name) for name in names))
+
+        quotes: Dict[str, ExchangePair] = {}
+        best_bid: Optional[Tuple[float, str]] = None
+        best_ask: Optional[Tuple[float, str]] = None
+        for snapshot in snapshots:
+            pair = snapshot.by_symbol.get(wanted)
+            if pair is None:
+                continue
+            quotes[snapshot.exchange] = pair
+            if pair.bid is not None and (best_bid is None or pair.bid > best_bid[0]):
+                best_bid = (pair.bid, snapshot.exchange)
+            if pair.ask is not None and (best_ask is None or pair.ask < best_ask[0]):
+                best_ask = (pair.ask, snapshot.exchange)
+
+        spread = spread_pct = None
+        if best_bid and best_ask:
+            spread = best_ask[0] - best_bid[0]
+            mid = (best_ask[0] + best_bid[0]) / 2
+            spread_pct = spread / mid * 100 if mid else None
+        return {
+            "symbol": wanted,
+            "best_bid": best_bid[0] if best_bid else None,
+            "best_bid_exchange": best_bid[1] if best_bid else None,
+            "best_ask": best_ask[0] if best_ask else None,
+            "best_ask_exchange": best_ask[1] if best_ask else None,
+            "spread": spread,
+            "spread_pct": spread_pct,
+            "exchanges": quotes,
+        }
+
+    async def run_refresh_loop(self):
+        """Background task keeping indexed exchanges fresh and evicting idle ones"""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self.refresh_active()
+
+    def refresh_active(self):
+        now = time.monotonic()
+        for exchange in list(self.snapshots):
+            if exchange in self.pinned or now - self._last_used.get(exchange, 0.0) < self.idle_timeout:
+                self.schedule_refresh(exchange)
+            else:
+                del self.snapshots[exchange]
+                self._last_used.pop(exchange, None)
+                self._refreshing.pop(exchange, None)
@@ -1,9 +1,14 @@
 import httpx
-from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from fastapi import HTTPException, status
 import asyncio
 from app.config import Settings
 import logging
+import time
+from app.utils.circuit_breaker import CircuitBreaker, OPEN
+from app.utils.json_stream import iter_container_items
+from app.utils.metrics import upstream_request_duration, upstream_circuit_open
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +19,11 @@ class FreeCryptoAPIService:
         # Removed API key from headers - will add to params instead
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=30.0,
+            timeout=settings.upstream_timeout,
         )
+        self.failure_threshold = settings.circuit_failure_threshold
+        self.recovery_timeout = settings.circuit_recovery_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
     
     async def __aenter__(self):
         return self
@@ -23,39 +31,99 @@ class FreeCryptoAPIService:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.client.aclose()
     
-    async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make authenticated request to FreeCryptoAPI"""
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+        return breaker
+    
+    @asynccontextmanager
+    async def _upstream_call(self, endpoint: str, params: Optional[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Guard one upstream call: circuit breaker, auth, metrics and error mapping"""
         if params is None:
             params = {}
         
+        if not self.api_key:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="FreeCryptoAPI key not configured (set FREECRYPTO_API_KEY)"
+            )
+        
+        # Fail fast while the endpoint's circuit is open
+        breaker = self._breaker(endpoint)
+        if not breaker.allow_request():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service unavailable: circuit open for {endpoint}"
+            )
+        
         # Add API key to every request as a query parameter
         params['api_key'] = self.api_key
         
-        # Debug logging to see what we're calling
-        logger.info(f"Calling {self.base_url}{endpoint} with params: {list(params.keys())}")
+        # Hot path: lazy %-formatting, skipped entirely unless DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calling %s%s with params: %s", self.base_url, endpoint, list(params))
         
+        start = time.perf_counter()
+        outcome = "error"
+        healthy = False
+        abandoned = False
         try:
-            response = await self.client.get(endpoint, params=params)
-            response.raise_for_status()
-            return response.json()
+            yield params
+            outcome = "ok"
+            healthy = True
         except httpx.HTTPStatusError as e:
-            logger.error(f"FreeCryptoAPI error: {e.response.status_code} - {e.response.text[:200]}")
+            # Client errors mean upstream is up; only 5xx and rate limiting trip the breaker
+            healthy = e.response.status_code < 500 and e.response.status_code != 429
+            logger.error("FreeCryptoAPI error: %s - %s", e.response.status_code, e.response.text[:200])
             raise HTTPException(
                 status_code=e.response.status_code,
                 detail=f"FreeCryptoAPI error: {e.response.text}"
             )
         except httpx.RequestError as e:
-            logger.error(f"Service error: {e}")
+            logger.error("Service error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Service unavailable: {str(e)}"
             )
+        except (GeneratorExit, asyncio.CancelledError):
+            # Our caller went away (e.g. a streaming client disconnected); says nothing about upstream
+            abandoned = True
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error: {str(e)}"
             )
+        finally:
+            if abandoned:
+                breaker.release()
+            elif healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            upstream_circuit_open.set(1 if breaker.state == OPEN else 0, endpoint=endpoint)
+            upstream_request_duration.observe(
+                time.perf_counter() - start, endpoint=endpoint, outcome=outcome
+            )
+    
+    async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Make authenticated request to FreeCryptoAPI"""
+        async with self._upstream_call(endpoint, params) as params:
+            response = await self.client.get(endpoint, params=params)
+            response.raise_for_status()
+            return response.json()
+    
+    async def _stream_request(self, endpoint: str, params: Dict[str, Any], container: str) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """Stream the items under ``container`` of the upstream JSON response, one at a time"""
+        async with self._upstream_call(endpoint, params) as params:
+            async with self.client.stream("GET", endpoint, params=params) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                async for item in iter_container_items(response.aiter_bytes(), container):
+                    yield item
     
     # Market Data
     async def get_crypto_list(self) -> Dict[str, Any]:
@@ -104,6 +172,12 @@ class FreeCryptoAPIService:
             params["symbols"] = ",".join(symbols)
         return await self._make_request("/getExchange", params)
     
+    def stream_exchange_pairs(self, exchange: str, symbols: Optional[List[str]] = None) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        params = {"exchange": exchange}
+        if symbols:
+            params["symbols"] = ",".join(symbols)
+        return self._stream_request("/getExchange", params, "pairs")
+    
     # Conversion
     async def get_conversion(self, from_symbol: str, to_symbol: str, amount: float = 1.0) -> Dict[str, Any]:
         params = {"from": from_symbol, "to": to_symbol, "amount": amount}
@@ -118,6 +192,10 @@ class FreeCryptoAPIService:
         params = {"symbol": symbol, "start": start_date, "end": end_date}
         return await self._make_request("/getTimeframe", params)
     
+    def stream_timeframe(self, symbol: str, start_date: str, end_date: str) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        params = {"symbol": symbol, "start": start_date, "end": end_date}
+        return self._stream_request("/getTimeframe", params, "data")
+    
     async def get_ohlc(self, symbol: str, days: int = 30) -> Dict[str, Any]:
         params = {"symbol": symbol, "days": days}
         return await self._make_request("/getOHLC", params)
\ No newline at end of file
@@ -2,7 +2,8 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import create_app
 from app.config import Settings
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
+import httpx
 
 @pytest.fixture
 def test_app():
@@ -21,4 +22,56 @@ def mock_settings():
         freecrypto_api_key="test_api_key",
         freecrypto_base_url="https://mock-api.com",
         app_env="testing"
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Isolate tests from the shared response cache"""
+    from app.dependencies import get_cache
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+@pytest.fixture
+def fake_client(test_app):
+    """Client for an app wired to the fake FreeCryptoAPI over an ASGI transport"""
+    from app.dependencies import get_crypto_repository, get_exchange_index
+    from app.repositories.crypto_repository import CryptoRepository
+    from app.services.exchange_index import ExchangeIndex
+    from app.services.freecrypto_api import FreeCryptoAPIService
+    from app.utils.cache import Cache
+    from benchmarks.fake_upstream import FakeFreeCryptoAPI
+
+    fake = FakeFreeCryptoAPI(exchange_pairs=250)
+    api = FreeCryptoAPIService(Settings(freecrypto_api_key="test", freecrypto_base_url="http://fake"))
+    api.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app), base_url="http://fake")
+    repo = CryptoRepository(api, Cache())
+    index = ExchangeIndex(repo)
+    test_app.dependency_overrides[get_crypto_repository] = lambda: repo
+    test_app.dependency_overrides[get_exchange_index] = lambda: index
+    return TestClient(test_app)
+
+
+@pytest.fixture
+def sio_emits():
+    """Records every Socket.IO emit as (event, room, data) instead of sending it"""
+    from app.routers import websocket
+
+    sent = []
+
+    async def capture(event, data=None, room=None, **kwargs):
+        sent.append((event, room, data))
+
+    with patch.object(websocket.sio, "emit", side_effect=capture):
+        yield sent
+
+
+@pytest.fixture
+def price_feed():
+    """Builds a repository mock whose real-time updates return the given prices in turn"""
+    def make(symbol, *prices):
+        repo = Mock()
+        repo.get_real_time_update = AsyncMock(side_effect=[{"data": {symbol: {"price": p}}} for p in prices])
+        return repo
+    return make
@@ -0,0 +1,177 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from app.models.schemas import AlertCreate, AlertDirection, AlertMetric
+from app.routers import websocket
+from app.services.alert_engine import AlertEngine, _ThresholdBook
+
+
+def _alert(engine, threshold, direction, metric=AlertMetric.price, symbol="btc"):
+    return engine.create(AlertCreate(symbol=symbol, metric=metric, direction=direction, threshold=threshold))
+
+
+def test_engine_fires_only_crossed_thresholds():
+    """Above fires when the value rises to its threshold, below when it falls to it, each once"""
+    engine = AlertEngine()
+    low, mid, high = (_alert(engine, t, AlertDirection.above) for t in (100, 200, 300))
+    floor = _alert(engine, 150, AlertDirection.below)
+
+    # First sighting only arms: nothing has crossed yet
+    assert engine.evaluate({"BTC": {AlertMetric.price: 90}}) == []
+
+    fired = engine.evaluate({"BTC": {AlertMetric.price: 250}})
+    assert {t.alert.id for t in fired} == {low.id, mid.id}
+
+    fired = engine.evaluate({"BTC": {AlertMetric.price: 120}})
+    assert [t.alert.id for t in fired] == [floor.id]
+
+    assert engine.evaluate({"BTC": {AlertMetric.price: 250}}) == []
+    assert [a.id for a in engine.list_alerts()] == [high.id]
+    assert engine.symbols() == {"BTC"}
+
+
+@pytest.mark.parametrize("direction, start, fired, kept", [
+    (AlertDirection.above, 50.0, ["a100", "b100", "c200"], ["d300"]),
+    (AlertDirection.below, 350.0, ["c200", "d300"], ["a100", "b100"]),
+])
+def test_threshold_book_fires_on_crossing(direction, start, fired, kept):
+    """Alerts arm on the near side of their threshold and fire once the value reaches it"""
+    book = _ThresholdBook(direction)
+    for alert_id in ("d300", "a100", "c200", "b100"):
+        book.add(float(alert_id[1:]), alert_id)
+
+    assert book.pop_fired(200.0) == []  # unarmed: no value seen yet
+    assert book.pop_fired(start) == []
+    assert sorted(book.pop_fired(200.0)) == fired
+    assert sorted(book.armed_ids) == kept
+
+
+def test_alert_already_past_threshold_waits_for_a_cross():
+    """An above alert created while the value is over it fires only after it dips and recovers"""
+    engine = AlertEngine()
+    _alert(engine, 60000, AlertDirection.above)  # keeps BTC polled
+    assert engine.evaluate({"BTC": {AlertMetric.price: 50000}}) == []
+
+    _alert(engine, 40000, AlertDirection.above)
+    assert engine.evaluate({"BTC": {AlertMetric.price: 50001}}) == []
+    assert engine.evaluate({"BTC": {AlertMetric.price: 39000}}) == []
+    assert [t.alert.threshold for t in engine.evaluate({"BTC": {AlertMetric.price: 41000}})] == [40000]
+
+
+def test_engine_delete_unindexes():
+    """Deleted alerts never fire and stop the symbol from being polled"""
+    engine = AlertEngine()
+    alert = _alert(engine, 10, AlertDirection.above, metric=AlertMetric.rsi)
+
+    engine.delete(alert.id)
+
+    assert engine.evaluate({"BTC": {AlertMetric.rsi: 90}}) == []
+    assert engine.symbols() == set()
+
+
+def test_rest_alert_lifecycle(client: TestClient):
+    """Create, list and cancel alerts over REST"""
+    created = client.post("/alerts", json={
+        "symbol": "eth", "direction": "above", "threshold": 5000, "channel": "risk-service"
+    })
+    assert created.status_code == 201
+    alert = created.json()
+    assert alert["symbol"] == "ETH"
+
+    assert [a["id"] for a in client.get("/alerts?channel=risk-service").json()] == [alert["id"]]
+    assert client.delete(f"/alerts/{alert['id']}").status_code == 200
+    assert client.delete(f"/alerts/{alert['id']}").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_tick_delivers_alert_triggered(sio_emits, price_feed):
+    """The poller fetches alerted symbols and emits alert_triggered to the owner"""
+    engine = AlertEngine()
+    repo = price_feed("SOL", 101.0, 99.0)
+    repo.get_technical_analysis = AsyncMock(side_effect=[{"rsi": 65.0}, {"rsi": 75.0}])
+
+    with patch("app.dependencies.get_alert_engine", return_value=engine):
+        await websocket.create_alert("owner", {"symbol": "SOL", "direction": "below", "threshold": 100})
+        await websocket.create_alert("owner", {"symbol": "SOL", "metric": "rsi", "direction": "above", "threshold": 70})
+        await websocket.broadcast_tick(repo, engine)
+        await websocket.broadcast_tick(repo, engine)
+        await websocket.disconnect("owner")
+
+    repo.get_real_time_update.assert_awaited_with(["SOL"])
+    triggered = [data for event, room, data in sio_emits if event == "alert_triggered" and room == "owner"]
+    assert sorted(t["alert"]["metric"] for t in triggered) == ["price", "rsi"]
+
+
+@pytest.mark.asyncio
+async def test_alert_channels_cannot_target_client_rooms(sio_emits, price_feed):
+    """Channels live in their own room namespace and may not name a connected sid"""
+    engine = AlertEngine()
+    repo = price_feed("ADA", 0.5, 2.0)
+    rooms = []
+
+    async def enter_room(sid, room, **kwargs):
+        rooms.append((sid, room))
+
+    with patch.object(websocket.sio, "enter_room", side_effect=enter_room), \
+            patch("app.dependencies.get_alert_engine", return_value=engine):
+        await websocket.connect("victim", {}, None)
+        await websocket.alerts_join("attacker", {"channel": "victim"})
+        await websocket.alerts_join("attacker", {"channel": "desk"})
+        await websocket.create_alert("attacker", {"symbol": "ADA", "direction": "above", "threshold": 1, "channel": "desk"})
+        await websocket.broadcast_tick(repo, engine)
+        await websocket.broadcast_tick(repo, engine)
+        await websocket.disconnect("victim")
+        await websocket.disconnect("attacker")
+
+    assert rooms == [("attacker", "alerts:desk")]
+    assert ("error", "attacker", {"message": "Channel name is reserved"}) in sio_emits
+    assert [room for event, room, _ in sio_emits if event == "alert_triggered"] == ["alerts:desk"]
+
+    engine.open_session("victim")
+    with pytest.raises(HTTPException) as exc:
+        engine.create(AlertCreate(symbol="ADA", direction="above", threshold=1, channel="victim"))
+    assert exc.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_disconnect_drops_owned_alerts_on_any_channel(sio_emits):
+    """Alerts a client created go away with it, whatever channel they deliver to"""
+    engine = AlertEngine()
+    with patch("app.dependencies.get_alert_engine", return_value=engine):
+        await websocket.connect("a", {}, None)
+        await websocket.create_alert("a", {"symbol": "BTC", "direction": "above", "threshold": 1, "channel": "custom"})
+        await websocket.create_alert("a", {"symbol": "ETH", "direction": "above", "threshold": 1})
+        rest = engine.create(AlertCreate(symbol="SOL", direction="above", threshold=1, channel="custom"))
+        await websocket.disconnect("a")
+
+    assert [a.id for a in engine.list_alerts()] == [rest.id]
+    assert engine.symbols() == {"SOL"}
+
+
+def test_alert_limits():
+    """Pending alerts are capped per owner/channel, and alerted symbols overall"""
+    engine = AlertEngine(max_per_group=2, max_symbols=3)
+    for _ in range(2):
+        engine.create(AlertCreate(symbol="BTC", direction="above", threshold=1, channel="desk"), owner="a")
+
+    for owner, channel in (("a", None), ("b", "desk")):
+        with pytest.raises(HTTPException) as exc:
+            engine.create(AlertCreate(symbol="BTC", direction="above", threshold=1, channel=channel), owner=owner)
+        assert exc.value.status_code == 429
+
+    engine.create(AlertCreate(symbol="ETH", direction="above", threshold=1), owner="b")
+    engine.create(AlertCreate(symbol="SOL", direction="above", threshold=1), owner="c")
+    with pytest.raises(HTTPException):
+        engine.create(AlertCreate(symbol="ADA", direction="above", threshold=1), owner="d")
+    engine.create(AlertCreate(symbol="SOL", direction="below", threshold=1), owner="d")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload", [None, ["id"], "text"])
+async def test_alert_handlers_reject_malformed_payloads(sio_emits, payload):
+    """Non-object payloads produce an error event, not a handler exception"""
+    await websocket.delete_alert("sid", payload)
+    await websocket.alerts_join("sid", payload)
+
+    assert [(event, room) for event, room, _ in sio_emits] == [("error", "sid"), ("error", "sid")]
@@ -0,0 +1,41 @@
+import pytest
+from benchmarks.run import ScenarioResult, _forwarded_args, check_regressions, parse_args, run_scenario
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", ["market_top", "market_data", "historical_ohlc", "socketio_broadcast"])
+async def test_scenarios_run_against_fake_upstream(scenario):
+    """Each benchmark scenario completes against the fake upstream"""
+    args = parse_args([
+        "--requests", "20", "--concurrency", "4", "--subscribers", "10",
+        "--ticks", "2", "--latency-ms", "0",
+    ])
+    result = await run_scenario(scenario, args)
+
+    assert result.errors == 0
+    assert result.requests > 0
+    assert result.upstream_calls > 0
+    assert result.p99_ms >= result.p50_ms
+    if scenario == "socketio_broadcast":
+        # Every real session received an update each tick
+        assert result.requests == 2
+        assert result.payload_bytes > 0
+
+
+def test_regression_gate():
+    """p99, throughput and upstream call regressions are reported"""
+    result = ScenarioResult(
+        scenario="market_top", requests=100, errors=0, duration_s=1.0, throughput_rps=50.0,
+        p50_ms=5.0, p99_ms=30.0, upstream_calls=12, peak_rss_mb=100.0,
+    )
+    baseline = {"market_top": {"p99_ms": 20.0, "throughput_rps": 100.0, "upstream_calls": 10}}
+
+    failures = check_regressions([result], baseline, tolerance=0.1)
+    assert len(failures) == 3
+    assert check_regressions([result], {}, tolerance=0.1) == []
+
+
+def test_isolated_runs_forward_scenario_options():
+    """Child runs keep tuning options but not scenario selection or gating"""
+    argv = ["--scenario", "market_top", "--requests", "50", "--json", "--baseline=b.json", "--encoding", "msgpack"]
+    assert _forwarded_args(argv) == ["--requests", "50", "--encoding", "msgpack"]
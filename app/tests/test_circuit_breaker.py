@@ -0,0 +1,63 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock, Mock
+from app.config import Settings
+from app.services.freecrypto_api import FreeCryptoAPIService
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def test_breaker_opens_and_recovers():
+    """Opens at the threshold, allows one half-open probe, closes on success"""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    with patch("app.utils.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    with patch("app.utils.circuit_breaker.time.monotonic", return_value=111.0):
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_service_fails_fast_when_circuit_open():
+    """After the threshold, upstream is not called at all"""
+    settings = Settings(freecrypto_api_key="test", circuit_failure_threshold=2)
+    service = FreeCryptoAPIService(settings)
+    service.client.get = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await service.get_fear_greed()
+    with pytest.raises(HTTPException) as exc:
+        await service.get_fear_greed()
+
+    assert exc.value.status_code == 503
+    assert "circuit open" in exc.value.detail
+    assert service.client.get.await_count == 2
+
+
+@patch("app.services.freecrypto_api.FreeCryptoAPIService._make_request", new_callable=AsyncMock)
+def test_serves_last_known_good_when_upstream_fails(mock_api, client: TestClient):
+    """Expired entries are served with staleness headers on upstream failure"""
+    mock_api.return_value = {"value": 40, "classification": "Fear"}
+    fake_time = Mock()
+    fake_time.time.return_value = 1000.0
+    with patch("app.utils.cache.time", fake_time):
+        assert client.get("/market/fear-greed").status_code == 200
+
+        fake_time.time.return_value = 1000.0 + 3000  # past the TTL, within max_stale
+        mock_api.side_effect = HTTPException(status_code=503, detail="down")
+        response = client.get("/market/fear-greed")
+
+    assert response.status_code == 200
+    assert response.json()["value"] == 40
+    assert response.headers["X-Data-Stale"] == "true"
+    assert response.headers["X-Data-Age"] == "3000"
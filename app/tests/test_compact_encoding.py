@@ -0,0 +1,44 @@
+import pytest
+from app.routers import websocket
+from app.utils.compact_encoding import COMPACT_FIELDS, pack, pack_row, pack_update
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, 127, 128, -1, -33, 70000, -70000, 2**40, -(2**40), 1.5,
+    "", "BTC", "x" * 40, "y" * 300, "Ω", [], [1, [2, 3]], list(range(20)), {"a": 1, "b": [None]},
+])
+def test_pack_matches_reference_msgpack(value):
+    """Output is byte-identical to the reference msgpack library"""
+    msgpack = pytest.importorskip("msgpack")
+    assert pack(value) == msgpack.packb(value, use_bin_type=True)
+
+
+def test_pack_update_layout():
+    """Pre-packed rows assemble into ["update", [[symbol, ...], ...]]"""
+    msgpack = pytest.importorskip("msgpack")
+    rows = [pack_row("BTC", {"price": 1.0, "change_24h": 2.0}), pack_row("ETH", None)]
+
+    decoded = msgpack.unpackb(pack_update(rows, len(rows)))
+
+    assert decoded == ["update", [["BTC", 1.0, 2.0, None, None], ["ETH", None, None, None, None]]]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_uses_negotiated_encoding(sio_emits, price_feed):
+    """msgpack clients get binary rows, JSON clients keep the dict payload"""
+    await websocket.connect("bin", {}, {"encoding": "msgpack"})
+    await websocket.connect("txt", {}, None)
+    for sid in ("bin", "txt"):
+        await websocket.subscribe(sid, {"symbols": ["BTC"]})
+    try:
+        await websocket.broadcast_tick(price_feed("BTC", 42.0))
+    finally:
+        for sid in ("bin", "txt"):
+            await websocket.disconnect(sid)
+
+    sent = {(room, event): data for event, room, data in sio_emits}
+    assert sent[("bin", "connected")]["fields"] == list(COMPACT_FIELDS)
+    assert sent[("txt", "connected")]["encoding"] == "json"
+    assert sent[("bin", "crypto_update")] == pack_update([pack_row("BTC", {"price": 42.0})], 1)
+    assert sent[("txt", "crypto_update")] == {"type": "update", "data": {"BTC": {"price": 42.0}}}
+    assert "bin" not in websocket.client_encodings
@@ -0,0 +1,175 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, Mock
+from app.models.schemas import ExchangePair
+from app.services.exchange_index import ExchangeIndex, ExchangeSnapshot, base_asset, quote_asset
+
+
+def _pair(symbol, price, volume, bid=None, ask=None):
+    return ExchangePair(symbol=symbol, price=price, volume=volume, bid=bid, ask=ask)
+
+
+def test_quote_asset_parsing():
+    """Longest known quote suffix wins; separators are honoured"""
+    assert quote_asset("BTCUSDT") == "USDT"
+    assert quote_asset("ETHBTC") == "BTC"
+    assert quote_asset("SOL/EUR") == "EUR"
+    assert quote_asset("XYZ") is None
+    assert base_asset("BTCUSDT") == "BTC"
+    assert base_asset("sol/eur") == "SOL"
+    assert base_asset("XYZ") == "XYZ"
+
+
+def test_snapshot_query_filters_and_sorts():
+    """Quote filter, min volume, sort key and limit are applied server-side"""
+    snapshot = ExchangeSnapshot("binance", {
+        "BTCUSDT": _pair("BTCUSDT", 100, 500),
+        "ETHUSDT": _pair("ETHUSDT", 10, 900),
+        "SOLUSDT": _pair("SOLUSDT", 1, 50),
+        "ETHBTC": _pair("ETHBTC", 0.05, 10000),
+    })
+
+    assert list(snapshot.query(quote="usdt")) == ["ETHUSDT", "BTCUSDT", "SOLUSDT"]
+    assert list(snapshot.query(quote="USDT", min_volume=100)) == ["ETHUSDT", "BTCUSDT"]
+    assert list(snapshot.query(sort="price", descending=False, limit=2)) == ["ETHBTC", "SOLUSDT"]
+
+
+@pytest.mark.asyncio
+async def test_best_quote_across_exchanges():
+    """Best bid is the highest bid, best ask the lowest ask, across exchanges"""
+    books = {
+        "binance": {"pairs": {"BTCUSDT": {"symbol": "BTCUSDT", "price": 100, "volume": 1, "bid": 99, "ask": 101}}},
+        "kraken": {"pairs": {"BTC/USDT": {"symbol": "BTC/USDT", "price": 100, "volume": 1, "bid": 99.5, "ask": 102}}},
+    }
+    repo = Mock()
+    repo.fetch_exchange_data = AsyncMock(side_effect=lambda exchange: books[exchange])
+    index = ExchangeIndex(repo)
+
+    quote = await index.best_quote("btc-usdt", ["binance", "kraken"])
+
+    assert quote["best_bid"] == 99.5 and quote["best_bid_exchange"] == "kraken"
+    assert quote["best_ask"] == 101 and quote["best_ask_exchange"] == "binance"
+    assert quote["spread"] == pytest.approx(1.5)
+    assert set(quote["exchanges"]) == {"binance", "kraken"}
+
+
+def test_exchange_data_top_n_by_volume(fake_client: TestClient):
+    """Top-N by volume for one quote asset comes back sorted and paged"""
+    response = fake_client.get("/exchange/data", params={
+        "exchange": "binance", "quote": "USDT", "sort": "volume", "limit": 5
+    })
+    assert response.status_code == 200
+    body = response.json()
+    volumes = [pair["volume"] for pair in body["pairs"].values()]
+    assert len(volumes) == 5
+    assert volumes == sorted(volumes, reverse=True)
+    assert all(name.endswith("USDT") for name in body["pairs"])
+    assert body["next_cursor"] is not None
+
+    quote = fake_client.get("/exchange/best-quote?symbol=BTCUSDT&exchanges=binance").json()
+    assert quote["best_bid_exchange"] == "binance"
+    assert quote["spread"] > 0
+
+
+def test_symbols_filter_matches_upstream_semantics(fake_client: TestClient):
+    """symbols selects base assets on both the plain and the indexed path"""
+    plain = fake_client.get("/exchange/data", params={"exchange": "binance", "symbols": "BTC"}).json()
+    indexed = fake_client.get("/exchange/data", params={
+        "exchange": "binance", "symbols": "btc", "quote": "USDT"
+    }).json()
+
+    assert indexed["pairs"]
+    assert set(indexed["pairs"]) <= set(plain["pairs"])
+    assert all(name.endswith("USDT") for name in indexed["pairs"])
+
+    by_name = fake_client.get("/exchange/data", params={
+        "exchange": "binance", "symbols": "btcusdt", "sort": "volume"
+    }).json()
+    assert list(by_name["pairs"]) == ["BTCUSDT"]
+
+
+@pytest.mark.asyncio
+async def test_idle_exchanges_are_evicted():
+    """Only pinned or recently queried exchanges keep being refreshed"""
+    repo = Mock()
+    repo.fetch_exchange_data = AsyncMock(return_value={"pairs": {}})
+    index = ExchangeIndex(repo, refresh_interval=15, pinned=["Binance"])
+    for exchange in ("binance", "kraken", "anything-at-all"):
+        await index.snapshot(exchange)
+
+    index._last_used["anything-at-all"] -= index.idle_timeout
+    index._last_used["binance"] -= index.idle_timeout
+    index.refresh_active()
+
+    assert set(index.snapshots) == {"binance", "kraken"}
+
+
+def test_keyset_paging_survives_refresh():
+    """Resuming after a sort key neither skips nor repeats pairs when the snapshot changes"""
+    before = ExchangeSnapshot("binance", {
+        name: _pair(name, 1, volume) for name, volume in
+        (("AUSDT", 500), ("BUSDT", 400), ("CUSDT", 300), ("DUSDT", 200), ("EUSDT", 100))
+    })
+    first = before.query(limit=2)
+    assert list(first) == ["AUSDT", "BUSDT"]
+    after = before.sort_key("BUSDT", "volume")
+
+    # Refresh: a pair already served is gone, and a new one lands ahead of the cursor
+    refreshed = ExchangeSnapshot("binance", {
+        name: _pair(name, 1, volume) for name, volume in
+        (("BUSDT", 400), ("CUSDT", 300), ("DUSDT", 200), ("EUSDT", 100), ("ZUSDT", 900))
+    })
+    assert list(refreshed.query(after=after)) == ["CUSDT", "DUSDT", "EUSDT"]
+    assert list(refreshed.query(sort="symbol", descending=False, after=("BUSDT", "BUSDT"))) == [
+        "CUSDT", "DUSDT", "EUSDT", "ZUSDT"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_forgets_evicted_and_unknown_exchanges():
+    """Neither evicted snapshots nor failed first fetches stay referenced"""
+    async def fetch(exchange):
+        if exchange == "nope":
+            raise HTTPException(status_code=404, detail="Unknown exchange")
+        return {"pairs": {}}
+
+    repo = Mock()
+    repo.fetch_exchange_data = AsyncMock(side_effect=fetch)
+    index = ExchangeIndex(repo, refresh_interval=15)
+
+    await index.snapshot("kraken")
+    with pytest.raises(HTTPException):
+        await index.snapshot("nope")
+    await asyncio.sleep(0)
+    assert index._refreshing == {}
+    assert set(index._last_used) == {"kraken"}
+
+    index._last_used["kraken"] -= index.idle_timeout
+    index.refresh_active()
+    assert index.snapshots == {} and index._last_used == {} and index._refreshing == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_never_stamps_stale_data_as_fresh():
+    """An upstream outage fails the refresh and keeps the old snapshot's age"""
+    from app.repositories.crypto_repository import CryptoRepository, make_cache_key
+    from app.utils.cache import Cache
+
+    api = Mock()
+    api.get_exchange_data = AsyncMock(return_value={"pairs": {"BTCUSDT": {"symbol": "BTCUSDT", "price": 1, "volume": 1}}})
+    cache = Cache()
+    repo = CryptoRepository(api, cache)
+    index = ExchangeIndex(repo, refresh_interval=15, pinned=["binance"])
+    first = await index.refresh("binance")
+
+    # The repository still holds a last-known-good copy the index must not pick up
+    key = make_cache_key("exchange", "binance", None)
+    cache._cache[key] = (time.time() - 1, time.time() - 1800, {"pairs": {}})
+    assert cache.get_stale(key) is not None
+    api.get_exchange_data.side_effect = HTTPException(status_code=503, detail="down")
+    with pytest.raises(HTTPException):
+        await index.refresh("binance")
+    assert index.snapshots["binance"] is first
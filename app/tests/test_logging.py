@@ -0,0 +1,56 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from app.config import Settings
+from app.utils.logs import DeferredQueueHandler, SamplingFilter, configure_logging
+
+
+def _record(level: int) -> logging.LogRecord:
+    return logging.LogRecord("app.services.freecrypto_api", level, __file__, 1, "msg", None, None)
+
+
+def test_sampling_filter_keeps_warnings():
+    """Sampling only drops records below WARNING"""
+    sampler = SamplingFilter(0.0)
+    assert not sampler.filter(_record(logging.INFO))
+    assert sampler.filter(_record(logging.WARNING))
+
+
+def test_configure_logging_levels_and_queue():
+    """Root logs through a single QueueHandler; engine.io is quiet outside development"""
+    configure_logging(Settings(freecrypto_api_key="test", app_env="production", log_level_websocket="DEBUG"))
+    configure_logging(Settings(freecrypto_api_key="test", app_env="production", log_level_websocket="DEBUG"))
+
+    queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+    assert len(queue_handlers) == 1
+    assert logging.getLogger("engineio").level == logging.WARNING
+    assert logging.getLogger("socketio").level == logging.WARNING
+    assert logging.getLogger("app.routers.websocket").level == logging.DEBUG
+
+    configure_logging(Settings(freecrypto_api_key="test", app_env="development"))
+    assert logging.getLogger("engineio").level == logging.INFO
+
+
+def test_formatting_runs_on_listener_thread():
+    """The calling thread only enqueues; the listener formats message and traceback"""
+    formatted_on = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            formatted_on.append((threading.current_thread(), self.format(record)))
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    listener = QueueListener(log_queue, RecordingHandler())
+    listener.start()
+    try:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "price %s", ("BTC",), None)
+        handler.handle(record)
+        queued_msg = record.msg
+    finally:
+        listener.stop()
+
+    assert queued_msg == "price %s"
+    assert formatted_on[0][0] is not threading.current_thread()
+    assert formatted_on[0][1] == "price BTC"
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+from app.routers import websocket
+from app.utils.metrics import MetricsRegistry, cache_requests, ws_symbol_subscriptions
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Histogram exposition is cumulative and ends with +Inf"""
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(5.0, route="/a")
+
+    output = registry.render()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in output
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'demo_seconds_count{route="/a"} 3' in output
+
+
+def test_metrics_endpoint(client: TestClient):
+    """Route latency is recorded per route template"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+
+
+@patch("app.services.freecrypto_api.FreeCryptoAPIService._make_request", new_callable=AsyncMock)
+def test_cache_hit_ratio_per_family(mock_api, client: TestClient):
+    """Cache lookups are counted per key family"""
+    mock_api.return_value = {"value": 50, "classification": "Neutral"}
+    hits = cache_requests.value(family="fear_greed", result="hit")
+
+    client.get("/market/fear-greed")
+    client.get("/market/fear-greed")
+
+    assert cache_requests.value(family="fear_greed", result="hit") == hits + 1
+    assert mock_api.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_symbol_subscription_series_stay_bounded(sio_emits):
+    """Symbols are normalized before labelling, junk is rejected, and zeroed series are dropped"""
+    await websocket.connect("metrics-sid", {}, None)
+    await websocket.subscribe("metrics-sid", {"symbols": ["btc", " BTC ", "eth"]})
+    await websocket.subscribe("metrics-sid", {"symbols": ["<script>", "x" * 100]})
+    assert ws_symbol_subscriptions.value(symbol="BTC") == 1
+    assert sio_emits[-1][0] == "error"
+
+    await websocket.unsubscribe("metrics-sid", {"symbols": ["eth"]})
+    await websocket.disconnect("metrics-sid")
+
+    rendered = "\n".join(ws_symbol_subscriptions.render())
+    assert 'symbol="BTC"' not in rendered and 'symbol="ETH"' not in rendered
+    assert 'symbol="<script>"' not in rendered and 'symbol="btc"' not in rendered
@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.repositories.crypto_repository import CryptoRepository, CACHE_TTLS, make_cache_key
+from app.utils.cache import Cache
+
+
+def test_cache_key_normalization():
+    """Symbols are case-folded and lists sorted"""
+    assert make_cache_key("crypto_data", ["eth", "BTC"], "usd") == make_cache_key("crypto_data", ["btc", "ETH"], "USD")
+    assert make_cache_key("volatility", None) == "volatility:"
+
+
+@pytest.mark.asyncio
+async def test_repository_serves_from_cache():
+    """Second read of the same (normalized) key does not hit upstream"""
+    api = Mock()
+    api.get_ath_atl = AsyncMock(return_value={"symbol": "BTC", "ath": 1.0})
+    repo = CryptoRepository(api, Cache())
+
+    first = await repo.get_ath_atl("btc")
+    second = await repo.get_ath_atl("BTC")
+
+    assert first == second
+    assert api.get_ath_atl.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_uses_per_endpoint_ttl():
+    """Entries expire according to CACHE_TTLS for their key family"""
+    api = Mock()
+    api.get_crypto_list = AsyncMock(return_value={"symbols": [], "pairs": {}})
+    cache = Cache()
+    cache.set = Mock(wraps=cache.set)
+    repo = CryptoRepository(api, cache)
+
+    await repo.get_crypto_list()
+
+    cache.set.assert_called_once_with("crypto_list", {"symbols": [], "pairs": {}}, CACHE_TTLS["crypto_list"])
+
+
+def test_cache_evicts_least_recently_used():
+    """The cache never holds more than max_entries; reads keep entries alive"""
+    cache = Cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache._cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_conversion_cached_per_pair():
+    """Different amounts share one cached rate and are scaled locally"""
+    api = Mock()
+    api.get_conversion = AsyncMock(return_value={"from": "BTC", "to": "USD", "amount": 1.0, "result": 50.0, "rate": 50.0})
+    cache = Cache()
+    repo = CryptoRepository(api, cache)
+
+    results = [await repo.get_conversion("btc", "usd", amount) for amount in (1, 2.5, 1000)]
+
+    assert [r["result"] for r in results] == [50.0, 125.0, 50000.0]
+    assert results[2]["amount"] == 1000
+    api.get_conversion.assert_awaited_once_with("btc", "usd", 1.0)
+    assert len(cache._cache) == 1
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.config import Settings
+from app.services.freecrypto_api import FreeCryptoAPIService
+from app.utils.lazy_asgi import LazyASGIApp
+from benchmarks.startup import StartupResult, check_budget, measure_startup
+
+
+def test_cold_start_defers_optional_subsystems():
+    """A fresh import serves its first request without loading httpx or socketio"""
+    result = measure_startup(repeat=1, profile=3)
+
+    assert result.status == 200
+    assert result.loaded_at_import == []
+    assert len(result.slowest_imports) == 3
+    assert check_budget(result) == []
+
+
+def test_startup_budget_gate():
+    """Budget overruns and eager imports are reported"""
+    result = StartupResult(
+        samples=1, import_ms=500.0, create_app_ms=5.0, lifespan_ms=1.0,
+        first_request_ms=50.0, total_ms=556.0, status=200, loaded_at_import=["socketio"],
+    )
+
+    assert len(check_budget(result, max_import_ms=400, max_total_ms=500)) == 3
+    assert len(check_budget(result, max_import_ms=600, max_total_ms=600)) == 1
+
+
+def test_lazy_asgi_app_loads_on_first_call():
+    """The mounted target is imported on first use and reused afterwards"""
+    lazy = LazyASGIApp("app.main:create_app")
+    assert lazy._app is None
+
+    factory = lazy.load()
+    assert lazy.load() is factory
+    assert TestClient(factory()).get("/health").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_missing_api_key_fails_upstream_calls_only(monkeypatch):
+    """Without an API key settings still load and upstream calls report 503"""
+    monkeypatch.delenv("FREECRYPTO_API_KEY", raising=False)
+    settings = Settings(_env_file=None)
+    assert settings.freecrypto_api_key is None
+
+    service = FreeCryptoAPIService(settings)
+    with pytest.raises(HTTPException) as exc:
+        await service._make_request("/getCryptoList")
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_background_failure_is_logged_and_shutdown_awaits_task():
+    """A crashed poller is reported; a running one is cancelled and awaited on shutdown"""
+    import asyncio
+    from unittest.mock import patch
+    from fastapi import FastAPI
+    import app.main as main
+
+    async def crash(settings):
+        raise RuntimeError("poller died")
+
+    with patch.object(main, "run_background", crash), patch.object(main, "logger") as logger:
+        async with main.lifespan(FastAPI()):
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+    assert logger.error.call_args.kwargs["exc_info"].args == ("poller died",)
+
+    stopped = asyncio.Event()
+
+    async def forever(settings):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            stopped.set()
+
+    with patch.object(main, "run_background", forever):
+        async with main.lifespan(FastAPI()):
+            await asyncio.sleep(0)
+    assert stopped.is_set()
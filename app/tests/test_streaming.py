@@ -0,0 +1,89 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.utils.json_stream import iter_container_items
+from app.utils.streaming import encode_cursor
+
+
+async def _chunks(payload: bytes, size: int):
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 4096])
+async def test_iter_container_items_across_chunk_boundaries(size):
+    """Items are decoded correctly however the bytes are split"""
+    document = {
+        "before": {"nested": [1, 2, {"pairs": "decoy"}]},
+        "pairs": {"BTCUSDT": {"price": 12345.678, "note": "Ω"}, "ETHUSDT": {"price": 10}},
+        "data": [1, 22, 333, {"x": None}],
+    }
+    payload = json.dumps(document).encode()
+
+    pairs = [item async for item in iter_container_items(_chunks(payload, size), "pairs")]
+    data = [item async for item in iter_container_items(_chunks(payload, size), "data")]
+
+    assert pairs == list(document["pairs"].items())
+    assert data == [(None, v) for v in document["data"]]
+
+
+def test_exchange_cursor_pagination(fake_client: TestClient):
+    """Following next_cursor visits every pair exactly once, in pair-name order"""
+    full = fake_client.get("/exchange/data?exchange=binance").json()["pairs"]
+
+    seen, cursor = [], None
+    while True:
+        params = {"exchange": "binance", "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        page = fake_client.get("/exchange/data", params=params).json()
+        assert len(page["pairs"]) <= 100
+        seen.extend(page["pairs"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(full)
+    assert fake_client.get("/exchange/data?exchange=binance&cursor=bogus").status_code == 400
+    first = fake_client.get("/exchange/data", params={"exchange": "binance", "limit": 10}).json()
+    mismatched = {"exchange": "binance", "sort": "volume", "cursor": first["next_cursor"]}
+    assert fake_client.get("/exchange/data", params=mismatched).status_code == 400
+    for position in (["volume", "x", "y"], ["volume", 1.0, 2], ["symbol", 1.0, "BTCUSDT"], ["volume", True, "BTCUSDT"]):
+        params = {"exchange": "binance", "sort": position[0], "cursor": encode_cursor(position)}
+        response = fake_client.get("/exchange/data", params=params)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_exchange_streaming_matches_buffered(fake_client: TestClient):
+    """Both streaming formats carry the same pairs as the buffered response"""
+    full = fake_client.get("/exchange/data?exchange=binance").json()
+
+    ndjson = fake_client.get("/exchange/data?exchange=binance&stream=ndjson")
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert lines == list(full["pairs"].values())
+
+    chunked = fake_client.get("/exchange/data?exchange=binance&stream=json").json()
+    assert chunked == {"exchange": "binance", "pairs": full["pairs"]}
+
+
+def test_timeframe_streaming(fake_client: TestClient):
+    """Timeframe records stream as NDJSON"""
+    response = fake_client.get(
+        "/historical/timeframe?symbol=BTC&start_date=2024-01-01&end_date=2024-12-31&stream=ndjson"
+    )
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 366
+
+
+def test_exchange_streaming_applies_filters(fake_client: TestClient):
+    """quote and min_volume filter the stream; sort and paging are rejected"""
+    params = {"exchange": "binance", "quote": "usdt", "min_volume": 1000, "stream": "ndjson"}
+    lines = [json.loads(line) for line in fake_client.get("/exchange/data", params=params).text.splitlines()]
+
+    assert lines
+    assert all(pair["symbol"].endswith("USDT") and pair["volume"] >= 1000 for pair in lines)
+    for extra in ({"sort": "volume"}, {"limit": 10}, {"cursor": "x"}):
+        assert fake_client.get("/exchange/data", params={**params, **extra}).status_code == 400
@@ -1,23 +1,49 @@
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from app.utils.metrics import cache_requests
 
 class Cache:
-    def __init__(self, default_ttl: int = 300):
+    """TTL cache with a last-known-good window, bounded to max_entries by LRU eviction"""
+
+    def __init__(self, default_ttl: int = 300, max_stale: int = 3600, max_entries: int = 10000):
         self.default_ttl = default_ttl
-        self._cache: Dict[str, tuple[float, Any]] = {}
-    
+        # Expired entries are kept this long as last-known-good fallbacks
+        self.max_stale = max_stale
+        # Keys embed free-form request input, so the entry count needs a hard cap
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, tuple[float, float, Any]]" = OrderedDict()  # key -> (expiry, stored_at, value)
+
     def get(self, key: str) -> Optional[Any]:
+        family = key.split(":", 1)[0]
         if key in self._cache:
-            expiry_time, value = self._cache[key]
-            if time.time() < expiry_time:
+            expiry_time, _, value = self._cache[key]
+            now = time.time()
+            if now < expiry_time:
+                self._cache.move_to_end(key)
+                cache_requests.inc(family=family, result="hit")
                 return value
-            else:
+            elif now >= expiry_time + self.max_stale:
                 del self._cache[key]
+        cache_requests.inc(family=family, result="miss")
         return None
-    
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, age in seconds) even if expired, within the stale window"""
+        if key in self._cache:
+            expiry_time, stored_at, value = self._cache[key]
+            now = time.time()
+            if now < expiry_time + self.max_stale:
+                return value, now - stored_at
+            del self._cache[key]
+        return None
+
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        expiry_time = time.time() + (ttl or self.default_ttl)
-        self._cache[key] = (expiry_time, value)
-    
+        now = time.time()
+        self._cache[key] = (now + (ttl or self.default_ttl), now, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
     def clear(self):
-        self._cache.clear()
\ No newline at end of file
+        self._cache.clear()
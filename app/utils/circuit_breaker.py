@@ -0,0 +1,64 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: opens after consecutive failures, probes once after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            # Let exactly one probe through; everyone else keeps failing fast
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release(self):
+        """Call abandoned without a verdict; let another request probe"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+# Per-request record of stale data served, filled in by the repository and
+# turned into response headers by the HTTP middleware. Holds a mutable dict so
+# writes from the endpoint task are visible to the middleware.
+_stale_state: ContextVar[Optional[Dict[str, float]]] = ContextVar("stale_state", default=None)
+
+
+def begin_stale_tracking() -> Dict[str, float]:
+    state: Dict[str, float] = {}
+    _stale_state.set(state)
+    return state
+
+
+def mark_stale(age: float):
+    state = _stale_state.get()
+    if state is not None:
+        state["age"] = max(state.get("age", 0.0), age)
@@ -0,0 +1,85 @@
+"""Minimal MessagePack encoder for the compact binary WebSocket mode.
+
+Covers the types crypto_update carries (nil, bool, int, float, str, arrays, maps),
+so the binary mode needs no extra dependency. Any MessagePack decoder can read it.
+"""
+import struct
+from typing import Any, Dict, Iterable, Optional
+
+# Field order of each per-symbol row in compact crypto_update payloads
+COMPACT_FIELDS = ("symbol", "price", "change_24h", "volume_24h", "market_cap")
+
+
+def array_header(length: int) -> bytes:
+    if length < 16:
+        return bytes((0x90 | length,))
+    if length < 0x10000:
+        return b"\xdc" + struct.pack(">H", length)
+    return b"\xdd" + struct.pack(">I", length)
+
+
+def _map_header(length: int) -> bytes:
+    if length < 16:
+        return bytes((0x80 | length,))
+    if length < 0x10000:
+        return b"\xde" + struct.pack(">H", length)
+    return b"\xdf" + struct.pack(">I", length)
+
+
+def _pack_int(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return bytes((value,))
+    if -32 <= value < 0:
+        return struct.pack(">b", value)
+    if value >= 0:
+        for marker, fmt, limit in ((0xcc, ">B", 0xff), (0xcd, ">H", 0xffff), (0xce, ">I", 0xffffffff)):
+            if value <= limit:
+                return bytes((marker,)) + struct.pack(fmt, value)
+        return b"\xcf" + struct.pack(">Q", value)
+    for marker, fmt, limit in ((0xd0, ">b", 0x80), (0xd1, ">h", 0x8000), (0xd2, ">i", 0x80000000)):
+        if value >= -limit:
+            return bytes((marker,)) + struct.pack(fmt, value)
+    return b"\xd3" + struct.pack(">q", value)
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    length = len(data)
+    if length < 32:
+        return bytes((0xa0 | length,)) + data
+    if length < 0x100:
+        return b"\xd9" + bytes((length,)) + data
+    if length < 0x10000:
+        return b"\xda" + struct.pack(">H", length) + data
+    return b"\xdb" + struct.pack(">I", length) + data
+
+
+def pack(value: Any) -> bytes:
+    if value is None:
+        return b"\xc0"
+    if value is True:
+        return b"\xc3"
+    if value is False:
+        return b"\xc2"
+    if isinstance(value, int):
+        return _pack_int(value)
+    if isinstance(value, float):
+        return b"\xcb" + struct.pack(">d", value)
+    if isinstance(value, str):
+        return _pack_str(value)
+    if isinstance(value, (list, tuple)):
+        return array_header(len(value)) + b"".join(pack(item) for item in value)
+    if isinstance(value, dict):
+        return _map_header(len(value)) + b"".join(pack(k) + pack(v) for k, v in value.items())
+    raise TypeError(f"Cannot pack {type(value).__name__}")
+
+
+def pack_row(symbol: str, data: Optional[Dict[str, Any]]) -> bytes:
+    """One symbol as a COMPACT_FIELDS-ordered array; missing data packs as nils"""
+    data = data or {}
+    return pack([symbol, *(data.get(field) for field in COMPACT_FIELDS[1:])])
+
+
+def pack_update(rows: Iterable[bytes], count: int) -> bytes:
+    """["update", [row, ...]] from pre-packed rows, so rows are encoded once per tick, not per client"""
+    return b"\x92" + _pack_str("update") + array_header(count) + b"".join(rows)
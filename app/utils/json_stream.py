@@ -0,0 +1,101 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _StreamBuffer:
+    """Text buffer over a byte stream; keeps only the unconsumed tail in memory"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.done = False
+
+    async def fill(self):
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.done = True
+            chunk = b""
+        self.text = self.text[self.pos:] + self._utf8.decode(chunk, final=self.done)
+        self.pos = 0
+
+    async def peek(self) -> Optional[str]:
+        """Next non-whitespace character, or None at end of stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if self.done:
+                return None
+            await self.fill()
+
+    async def expect(self, char: str):
+        if await self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.text, self.pos)
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it is unambiguous"""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self.text) or self.done:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.done:
+                    raise
+            await self.fill()
+
+
+async def iter_container_items(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    """Yield the items of the array or object stored under ``key`` of a top-level JSON object.
+
+    Array elements are yielded as ``(None, value)``, object members as ``(name, value)``.
+    Only one item is held in memory at a time; input after the container is not read.
+    """
+    buf = _StreamBuffer(chunks)
+    await buf.expect("{")
+    while True:
+        char = await buf.peek()
+        if char == "}" or char is None:
+            return
+        if char == ",":
+            buf.pos += 1
+            continue
+
+        name = await buf.value()
+        await buf.expect(":")
+        if name != key:
+            await buf.value()  # skip sibling field
+            continue
+
+        opening = await buf.peek()
+        if opening not in ("[", "{"):
+            return
+        closing = "]" if opening == "[" else "}"
+        buf.pos += 1
+        while True:
+            char = await buf.peek()
+            if char == closing:
+                return
+            if char is None:
+                raise json.JSONDecodeError("Unterminated container", buf.text, buf.pos)
+            if char == ",":
+                buf.pos += 1
+                continue
+            if opening == "[":
+                yield None, await buf.value()
+            else:
+                member = await buf.value()
+                await buf.expect(":")
+                yield member, await buf.value()
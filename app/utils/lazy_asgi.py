@@ -0,0 +1,23 @@
+import importlib
+from typing import Any, Callable, Optional
+
+
+class LazyASGIApp:
+    """Mountable ASGI app that imports ``module:attribute`` on its first call.
+
+    Keeps optional subsystems (socketio) out of import and startup time until
+    a client actually reaches them.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self._app: Optional[Callable[..., Any]] = None
+
+    def load(self) -> Callable[..., Any]:
+        if self._app is None:
+            module, attribute = self.target.split(":")
+            self._app = getattr(importlib.import_module(module), attribute)
+        return self._app
+
+    async def __call__(self, scope, receive, send):
+        await self.load()(scope, receive, send)
@@ -0,0 +1,102 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.config import Settings
+
+# Logger name prefixes per subsystem, mapped to the Settings field holding their level
+SUBSYSTEM_LOGGERS: Dict[str, str] = {
+    "app.services": "log_level_upstream",
+    "app.repositories": "log_level_upstream",
+    "app.routers.websocket": "log_level_websocket",
+    "socketio": "log_level_libraries",
+    "engineio": "log_level_libraries",
+    "httpx": "log_level_libraries",
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted, so interpolation and tracebacks run on the listener thread.
+
+    The stock prepare() formats on the calling thread to make records picklable;
+    this queue never leaves the process, so a shallow copy is enough.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
+
+
+def configure_logging(settings: Settings):
+    """Route all logging through a queue so the request path never blocks on I/O"""
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        root.removeHandler(_queue_handler)
+
+    stream = logging.StreamHandler(sys.stderr)
+    if settings.log_format == "json":
+        stream.setFormatter(JSONFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    if settings.log_sample_rate < 1.0:
+        _queue_handler.addFilter(SamplingFilter(settings.log_sample_rate))
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.log_level.upper())
+
+    for prefix, field in SUBSYSTEM_LOGGERS.items():
+        level = getattr(settings, field)
+        if level is None:
+            # Socket.IO/engine.io/httpx log every packet or request; keep them quiet outside development
+            level = "INFO" if settings.app_env == "development" else "WARNING"
+        logging.getLogger(prefix).setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
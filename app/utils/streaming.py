@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 64 * 1024  # bytes buffered before each write
+
+
+async def _empty() -> AsyncIterator[Any]:
+    return
+    yield
+
+
+async def prime(items: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Pull the first item now, so upstream errors surface as a normal HTTP error
+    instead of a stream that breaks after the 200 headers were sent"""
+    iterator = items.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        return _empty()
+
+    async def chained():
+        yield first
+        async for item in iterator:
+            yield item
+
+    return chained()
+
+
+async def _batched(pieces: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    buffer, size = [], 0
+    async for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def _ndjson(records: AsyncIterator[Tuple[Optional[str], Any]]) -> AsyncIterator[str]:
+    async for _, value in records:
+        yield json.dumps(value) + "\n"
+
+
+async def _json_document(head: Dict[str, Any], field: str, records: AsyncIterator[Tuple[Optional[str], Any]],
+                         keyed: bool) -> AsyncIterator[str]:
+    opening, closing = ("{", "}") if keyed else ("[", "]")
+    prefix = json.dumps(head)[:-1]
+    yield f'{prefix}{", " if head else ""}{json.dumps(field)}: {opening}'
+    separator = ""
+    async for key, value in records:
+        member = f"{json.dumps(key)}: " if keyed else ""
+        yield f"{separator}{member}{json.dumps(value)}"
+        separator = ", "
+    yield closing + "}"
+
+
+def stream_records(records: AsyncIterator[Tuple[Optional[str], Any]], fmt: str,
+                   head: Dict[str, Any], field: str, keyed: bool) -> StreamingResponse:
+    """Stream ``(key, value)`` records as NDJSON lines, or as ``{**head, field: [...]/{...}}``"""
+    if fmt == "ndjson":
+        return StreamingResponse(_batched(_ndjson(records)), media_type="application/x-ndjson")
+    return StreamingResponse(_batched(_json_document(head, field, records, keyed)), media_type="application/json")
+
+
+def encode_cursor(position: List[Any]) -> str:
+    """Opaque cursor for a keyset position, e.g. the sort key of the last item served"""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(position, list):
+            raise ValueError(position)
+        return position
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
@@ -0,0 +1,190 @@
+"""Local stand-in for FreeCryptoAPI with configurable latency, errors and rate limits.
+
+Run standalone and point the app at it with FREECRYPTO_BASE_URL:
+
+    python -m benchmarks.fake_upstream --port 9000 --latency-ms 50 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+SYMBOLS = [
+    "BTC", "ETH", "BNB", "SOL", "XRP", "ADA", "DOGE", "TRX", "DOT", "MATIC",
+    "LTC", "AVAX", "LINK", "ATOM", "XLM", "ETC", "BCH", "NEAR", "APT", "FIL",
+]
+
+
+class FakeFreeCryptoAPI:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        exchange_pairs: int = 200,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit  # requests per second, None for unlimited
+        self.exchange_pairs = exchange_pairs
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.app = self._create_app()
+
+    def reset(self):
+        self.calls.clear()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _price(self, symbol: str) -> float:
+        return float(1000 + (sum(map(ord, symbol)) * 37) % 50000)
+
+    def _pair(self, symbol: str, currency: str = "USD") -> Dict:
+        price = self._price(symbol)
+        return {
+            "symbol": symbol,
+            "name": symbol.title(),
+            "currency": currency,
+            "price": price,
+            "market_cap": price * 1e7,
+            "volume_24h": price * 1e5,
+            "change_24h": round(self._random.uniform(-5, 5), 2),
+        }
+
+    async def _simulate(self, endpoint: str) -> Optional[JSONResponse]:
+        """Apply latency, rate limiting and injected errors; return an error response if any"""
+        self.calls[endpoint] += 1
+
+        if self.rate_limit is not None:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return JSONResponse({"error": "rate limit exceeded"}, status_code=429)
+
+        delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=502)
+        return None
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI(title="Fake FreeCryptoAPI")
+
+        @app.get("/getCryptoList")
+        async def get_crypto_list():
+            if (error := await self._simulate("/getCryptoList")) is not None:
+                return error
+            return {"symbols": SYMBOLS, "pairs": {s: s.title() for s in SYMBOLS}}
+
+        @app.get("/getData")
+        async def get_data(symbols: str = Query(...), currency: str = Query("USD")):
+            if (error := await self._simulate("/getData")) is not None:
+                return error
+            return {"data": {s: self._pair(s, currency) for s in symbols.split(",") if s}}
+
+        @app.get("/getTop")
+        async def get_top(limit: int = Query(100), currency: str = Query("USD")):
+            if (error := await self._simulate("/getTop")) is not None:
+                return error
+            top = [self._pair(SYMBOLS[i % len(SYMBOLS)], currency) for i in range(limit)]
+            for rank, item in enumerate(top, start=1):
+                item["rank"] = rank
+            return {"data": top}
+
+        @app.get("/getOHLC")
+        async def get_ohlc(symbol: str = Query(...), days: int = Query(30)):
+            if (error := await self._simulate("/getOHLC")) is not None:
+                return error
+            return {"symbol": symbol, "candles": self._candles(symbol, date.today() - timedelta(days=days), days)}
+
+        @app.get("/getHistory")
+        async def get_history(symbol: str = Query(...), days: int = Query(30)):
+            if (error := await self._simulate("/getHistory")) is not None:
+                return error
+            return {"symbol": symbol, "data": self._candles(symbol, date.today() - timedelta(days=days), days)}
+
+        @app.get("/getTimeframe")
+        async def get_timeframe(symbol: str = Query(...), start: str = Query(...), end: str = Query(...)):
+            if (error := await self._simulate("/getTimeframe")) is not None:
+                return error
+            first, last = date.fromisoformat(start), date.fromisoformat(end)
+            return {"symbol": symbol, "data": self._candles(symbol, first, (last - first).days + 1)}
+
+        @app.get("/getExchange")
+        async def get_exchange(exchange: str = Query(...), symbols: Optional[str] = Query(None)):
+            if (error := await self._simulate("/getExchange")) is not None:
+                return error
+            bases = symbols.split(",") if symbols else SYMBOLS
+            quotes = ["USDT", "USD", "BTC", "ETH", "EUR"]
+            result = {}
+            for i in range(self.exchange_pairs):
+                # Suffix a generation number once every base/quote combination is used up
+                generation = i // (len(bases) * len(quotes))
+                name = f"{bases[i % len(bases)]}{generation or ''}{quotes[(i // len(bases)) % len(quotes)]}"
+                price = self._price(name)
+                result[name] = {
+                    "symbol": name,
+                    "price": price,
+                    "volume": float((i * 7919) % 100000),
+                    "bid": price * 0.999,
+                    "ask": price * 1.001,
+                }
+            return {"exchange": exchange, "pairs": result}
+
+        return app
+
+    def _candles(self, symbol: str, start: date, days: int) -> List[Dict]:
+        base = self._price(symbol)
+        candles = []
+        for i in range(max(days, 0)):
+            open_ = base * (1 + ((i * 13) % 7 - 3) / 100)
+            close = base * (1 + ((i * 17) % 7 - 3) / 100)
+            candles.append({
+                "date": (start + timedelta(days=i)).isoformat() + "T00:00:00",
+                "open": open_,
+                "high": max(open_, close) * 1.01,
+                "low": min(open_, close) * 0.99,
+                "close": close,
+                "volume": base * 1000,
+            })
+        return candles
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per second")
+    parser.add_argument("--exchange-pairs", type=int, default=200)
+    args = parser.parse_args()
+
+    fake = FakeFreeCryptoAPI(
+        args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, args.exchange_pairs
+    )
+    uvicorn.run(fake.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Minimal Socket.IO client over Engine.IO long-polling, driven through an ASGI transport.
+
+Lets benchmarks exercise the real server path (packet encoding, per-session
+queues, HTTP delivery) with httpx alone; python-socketio's own client needs
+aiohttp and a listening socket.
+"""
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+PATH = "/socket.io/"
+SEPARATOR = "\x1e"  # Engine.IO v4 payload separator
+
+
+class PollingSocketIOClient:
+    def __init__(self, http: httpx.AsyncClient):
+        self.http = http
+        self.sid: Optional[str] = None
+        self.bytes_received = 0
+
+    def _params(self) -> Dict[str, str]:
+        params = {"EIO": "4", "transport": "polling"}
+        if self.sid:
+            params["sid"] = self.sid
+        return params
+
+    async def _post(self, packet: str):
+        response = await self.http.post(PATH, params=self._params(), content=packet.encode())
+        response.raise_for_status()
+
+    async def connect(self, auth: Optional[Dict[str, Any]] = None):
+        response = await self.http.get(PATH, params=self._params())
+        response.raise_for_status()
+        self.sid = json.loads(response.text[1:])["sid"]  # "0{...}" open packet
+        await self._post("40" + (json.dumps(auth) if auth else ""))
+        await self.receive_until({"connected"})
+
+    async def emit(self, event: str, data: Any):
+        await self._post("42" + json.dumps([event, data]))
+
+    async def poll(self) -> List[Tuple[str, Any]]:
+        """One long-poll; returns the (event, data) pairs delivered, answering pings"""
+        response = await self.http.get(PATH, params=self._params())
+        response.raise_for_status()
+        self.bytes_received += len(response.content)
+        events, pong = [], False
+        for packet in response.text.split(SEPARATOR):
+            if packet == "2":
+                pong = True
+            elif packet.startswith("42") or packet.startswith("45"):
+                # event, or binary event whose attachment follows as a "b<base64>" packet
+                name, *args = json.loads(packet[packet.index("["):])
+                events.append((name, args[0] if args else None))
+            elif packet.startswith("1"):
+                raise ConnectionError("session closed by server")
+        if pong:
+            await self._post("3")
+        return events
+
+    async def receive_until(self, wanted: Set[str]) -> List[Tuple[str, Any]]:
+        received: List[Tuple[str, Any]] = []
+        while not wanted.intersection(name for name, _ in received):
+            received.extend(await self.poll())
+        return received
+
+    async def close(self):
+        if self.sid:
+            await self._post("1")
+            self.sid = None
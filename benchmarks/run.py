@@ -0,0 +1,338 @@
+"""Load scenarios against the app wired to the local fake FreeCryptoAPI.
+
+Everything runs in-process over ASGI transports, so results measure the
+app itself rather than the network. Examples:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario market_top --requests 2000 --concurrency 50
+    python -m benchmarks.run --json > bench_output.txt
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.2
+
+With several scenarios selected, each runs in its own interpreter so
+peak_rss_mb is per scenario.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.config import Settings
+from app.dependencies import get_crypto_repository
+from app.main import create_app
+from app.repositories.crypto_repository import CryptoRepository
+from app.routers import websocket
+from app.services.freecrypto_api import FreeCryptoAPIService
+from app.utils.cache import Cache
+from app.utils.logs import configure_logging
+from benchmarks.fake_upstream import FakeFreeCryptoAPI, SYMBOLS
+from benchmarks.polling_client import PollingSocketIOClient
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    upstream_calls: int
+    peak_rss_mb: float
+    traced_peak_mb: Optional[float] = None
+    payload_bytes: Optional[int] = None
+    upstream_by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class BenchEnvironment:
+    """App + repository wired to a FakeFreeCryptoAPI over ASGI transports"""
+
+    def __init__(self, fake: FakeFreeCryptoAPI):
+        self.fake = fake
+        settings = Settings(
+            freecrypto_api_key="bench", freecrypto_base_url="http://fake-upstream", app_env="production"
+        )
+        self.api = FreeCryptoAPIService(settings)
+        self.api.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fake.app), base_url=settings.freecrypto_base_url
+        )
+        self.repo = CryptoRepository(self.api, Cache(settings.cache_ttl))
+        self.app = create_app()
+        # Measure with production logging regardless of the local .env
+        configure_logging(settings)
+        self.app.dependency_overrides[get_crypto_repository] = lambda: self.repo
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url="http://bench"
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+        await self.api.client.aclose()
+
+
+RequestFactory = Callable[[BenchEnvironment, int], Awaitable[httpx.Response]]
+
+
+def _market_top(env: BenchEnvironment, i: int) -> Awaitable[httpx.Response]:
+    return env.client.get("/market/top", params={"limit": (10, 50, 100)[i % 3]})
+
+
+def _market_data(env: BenchEnvironment, i: int) -> Awaitable[httpx.Response]:
+    symbols = [SYMBOLS[(i + k) % len(SYMBOLS)] for k in range(1 + i % 5)]
+    return env.client.post("/market/data", json={"symbols": symbols, "currency": "USD"})
+
+
+def _historical_ohlc(env: BenchEnvironment, i: int) -> Awaitable[httpx.Response]:
+    return env.client.get(
+        "/historical/ohlc", params={"symbol": SYMBOLS[i % len(SYMBOLS)], "days": 30 + i % 335}
+    )
+
+
+REST_SCENARIOS: Dict[str, RequestFactory] = {
+    "market_top": _market_top,
+    "market_data": _market_data,
+    "historical_ohlc": _historical_ohlc,
+}
+
+
+async def run_rest_scenario(env: BenchEnvironment, name: str, total: int, concurrency: int) -> tuple:
+    factory = REST_SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await factory(env, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run_socketio_scenario(env: BenchEnvironment, subscribers: int, ticks: int,
+                                symbols_per_client: int, encoding: str = "json",
+                                delivery_timeout: float = 10.0) -> tuple:
+    """Connect N real Socket.IO sessions and time each tick until every one has its crypto_update.
+
+    Sessions speak Engine.IO long-polling through an ASGI transport, so packet
+    encoding, per-session queues and HTTP delivery are all measured.
+    payload_bytes is the crypto_update traffic as received; on polling, binary
+    (msgpack) attachments are base64-encoded, unlike on the websocket transport.
+    A subscriber that misses an update within delivery_timeout counts as an error.
+    """
+    http = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=websocket.socket_app), base_url="http://bench",
+        timeout=delivery_timeout,
+    )
+    baseline_connections = len(websocket.active_connections)
+    clients = [PollingSocketIOClient(http) for _ in range(subscribers)]
+
+    async def join(n: int, client: PollingSocketIOClient):
+        await client.connect({"encoding": encoding})
+        await client.emit("subscribe", {
+            "symbols": [SYMBOLS[(n + k) % len(SYMBOLS)] for k in range(symbols_per_client)]
+        })
+        await client.receive_until({"subscribed"})
+
+    latencies: List[float] = []
+    errors = 0
+    try:
+        await asyncio.gather(*(join(n, client) for n, client in enumerate(clients)))
+        for client in clients:
+            client.bytes_received = 0
+        for _ in range(ticks):
+            start = time.perf_counter()
+            await websocket.broadcast_tick(env.repo)
+            delivered = await asyncio.gather(
+                *(asyncio.wait_for(client.receive_until({"crypto_update"}), delivery_timeout) for client in clients),
+                return_exceptions=True
+            )
+            latencies.append(time.perf_counter() - start)
+            errors += sum(isinstance(result, BaseException) for result in delivered)
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+        # Disconnect handlers run as server tasks; let them finish before the next scenario
+        for _ in range(100):
+            if len(websocket.active_connections) <= baseline_connections:
+                break
+            await asyncio.sleep(0.01)
+        await http.aclose()
+    return latencies, errors, sum(client.bytes_received for client in clients)
+
+
+async def run_scenario(name: str, args: argparse.Namespace) -> ScenarioResult:
+    fake = FakeFreeCryptoAPI(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, seed=args.seed,
+    )
+    env = BenchEnvironment(fake)
+    gc.collect()
+    if args.trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    payload_bytes = None
+    try:
+        if name == "socketio_broadcast":
+            latencies, errors, payload_bytes = await run_socketio_scenario(
+                env, args.subscribers, args.ticks, args.symbols_per_client, args.encoding
+            )
+        else:
+            latencies, errors = await run_rest_scenario(env, name, args.requests, args.concurrency)
+    finally:
+        duration = time.perf_counter() - start
+        traced_peak = None
+        if args.trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+        await env.aclose()
+
+    return ScenarioResult(
+        scenario=name,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=round(duration, 4),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        p50_ms=round(_percentile(latencies, 50) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 3),
+        upstream_calls=fake.total_calls,
+        peak_rss_mb=round(_peak_rss_mb(), 2),
+        traced_peak_mb=round(traced_peak, 3) if traced_peak is not None else None,
+        payload_bytes=payload_bytes,
+        upstream_by_endpoint=dict(fake.calls),
+    )
+
+
+def check_regressions(results: List[ScenarioResult], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Compare against a baseline; p99 and upstream calls may not grow, throughput may not drop"""
+    failures = []
+    for result in results:
+        base = baseline.get(result.scenario)
+        if not base:
+            continue
+        if result.p99_ms > base["p99_ms"] * (1 + tolerance):
+            failures.append(f"{result.scenario}: p99 {result.p99_ms}ms > baseline {base['p99_ms']}ms")
+        if result.throughput_rps < base["throughput_rps"] * (1 - tolerance):
+            failures.append(
+                f"{result.scenario}: throughput {result.throughput_rps}rps < baseline {base['throughput_rps']}rps"
+            )
+        if result.upstream_calls > base["upstream_calls"]:
+            failures.append(
+                f"{result.scenario}: upstream calls {result.upstream_calls} > baseline {base['upstream_calls']}"
+            )
+    return failures
+
+
+def _print_table(results: List[ScenarioResult]):
+    header = f"{'scenario':<20} {'reqs':>6} {'err':>5} {'rps':>10} {'p50 ms':>9} {'p99 ms':>9} {'upstream':>9} {'rss MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.scenario:<20} {r.requests:>6} {r.errors:>5} {r.throughput_rps:>10.1f} "
+            f"{r.p50_ms:>9.3f} {r.p99_ms:>9.3f} {r.upstream_calls:>9} {r.peak_rss_mb:>8.1f}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the API against a fake FreeCryptoAPI")
+    parser.add_argument(
+        "--scenario", action="append", choices=[*REST_SCENARIOS, "socketio_broadcast"],
+        help="scenario to run (repeatable, default: all)"
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--symbols-per-client", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json",
+                        help="crypto_update encoding negotiated by simulated subscribers")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None, help="upstream requests per second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="report tracemalloc peak (slower)")
+    parser.add_argument("--json", action="store_true", help="emit results as JSON")
+    parser.add_argument("--baseline", help="JSON file of results to gate against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    return parser.parse_args(argv)
+
+
+def _forwarded_args(argv: List[str]) -> List[str]:
+    """argv without the options main() handles itself"""
+    forwarded, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ("--scenario", "--baseline"):
+            skip = True
+        elif not arg.startswith(("--scenario=", "--baseline=", "--json")):
+            forwarded.append(arg)
+    return forwarded
+
+
+def run_isolated(name: str, argv: List[str]) -> ScenarioResult:
+    """Run one scenario in a fresh interpreter, so peak_rss_mb is that scenario's own peak"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", *_forwarded_args(argv), "--scenario", name, "--json"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return ScenarioResult(**json.loads(output)[name])
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    scenarios = args.scenario or [*REST_SCENARIOS, "socketio_broadcast"]
+    if len(scenarios) == 1:
+        results = [await run_scenario(scenarios[0], args)]
+    else:
+        # ru_maxrss only ever grows, so scenarios sharing a process would report earlier peaks
+        results = [await asyncio.to_thread(run_isolated, name, argv) for name in scenarios]
+
+    if args.json:
+        print(json.dumps({r.scenario: asdict(r) for r in results}, indent=2))
+    else:
+        _print_table(results)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_regressions(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
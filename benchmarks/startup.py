@@ -0,0 +1,189 @@
+"""Cold-start profile: import time, app construction and time to first request.
+
+Every sample runs in a fresh interpreter, so nothing is imported or cached
+beforehand. Examples:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --profile 15
+    python -m benchmarks.startup --max-import-ms 600 --max-total-ms 900
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsystems the app should only load once they are used
+DEFERRED_MODULES = ("httpx", "socketio", "engineio", "uvicorn")
+
+# Runs in the fresh interpreter. The first request is driven with raw ASGI
+# messages so no client library is imported into the measured process.
+_PROBE = """
+import time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+import asyncio, json, sys
+application = app.main.create_app()
+t2 = time.perf_counter()
+loaded_at_import = [m for m in {deferred!r} if m in sys.modules]
+
+async def get(path):
+    scope = {{
+        "type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"startup")], "client": ("127.0.0.1", 0),
+        "server": ("startup", 80),
+    }}
+    sent = {{}}
+    async def receive():
+        return {{"type": "http.request", "body": b"", "more_body": False}}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+    await application(scope, receive, send)
+    return sent.get("status")
+
+async def main():
+    async with application.router.lifespan_context(application):
+        t3 = time.perf_counter()
+        status = await get({path!r})
+        t4 = time.perf_counter()
+    return t3, t4, status
+
+t3, t4, status = asyncio.run(main())
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000,
+    "lifespan_ms": (t3 - t2) * 1000, "first_request_ms": (t4 - t3) * 1000,
+    "total_ms": (t4 - t0) * 1000, "status": status, "loaded_at_import": loaded_at_import,
+}}))
+"""
+
+
+@dataclass
+class StartupResult:
+    samples: int
+    import_ms: float
+    create_app_ms: float
+    lifespan_ms: float
+    first_request_ms: float
+    total_ms: float
+    status: int
+    loaded_at_import: List[str] = field(default_factory=list)
+    slowest_imports: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["APP_ENV"] = "production"  # keep library debug logging out of the timings
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (ROOT, env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _run_probe(path: str) -> Dict:
+    code = _PROBE.format(deferred=DEFERRED_MODULES, path=path)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=_child_env(),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def profile_imports(top: int = 10) -> List[Tuple[str, float]]:
+    """Self import time of ``import app.main`` per top-level package, slowest first"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=ROOT, env=_child_env(),
+        capture_output=True, text=True, check=True,
+    ).stderr
+    totals: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        package = module.strip().split(".")[0]
+        totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [(name, round(ms, 1)) for name, ms in ranked[:top]]
+
+
+def measure_startup(repeat: int = 5, path: str = "/health", profile: int = 0) -> StartupResult:
+    """Median of each cold-start phase over ``repeat`` fresh interpreters"""
+    samples = [_run_probe(path) for _ in range(repeat)]
+
+    def median(key: str) -> float:
+        return round(statistics.median(sample[key] for sample in samples), 3)
+
+    return StartupResult(
+        samples=repeat,
+        import_ms=median("import_ms"),
+        create_app_ms=median("create_app_ms"),
+        lifespan_ms=median("lifespan_ms"),
+        first_request_ms=median("first_request_ms"),
+        total_ms=median("total_ms"),
+        status=samples[-1]["status"],
+        loaded_at_import=sorted({m for sample in samples for m in sample["loaded_at_import"]}),
+        slowest_imports=profile_imports(profile) if profile else [],
+    )
+
+
+def check_budget(result: StartupResult, max_import_ms: Optional[float] = None,
+                 max_total_ms: Optional[float] = None) -> List[str]:
+    """Startup must stay within the given budgets and keep deferred subsystems unloaded"""
+    failures = []
+    if max_import_ms is not None and result.import_ms > max_import_ms:
+        failures.append(f"import {result.import_ms}ms > budget {max_import_ms}ms")
+    if max_total_ms is not None and result.total_ms > max_total_ms:
+        failures.append(f"time to first request {result.total_ms}ms > budget {max_total_ms}ms")
+    if result.loaded_at_import:
+        failures.append(f"imported eagerly: {', '.join(result.loaded_at_import)}")
+    if result.status != 200:
+        failures.append(f"first request returned {result.status}")
+    return failures
+
+
+def _print_report(result: StartupResult):
+    for phase in ("import_ms", "create_app_ms", "lifespan_ms", "first_request_ms", "total_ms"):
+        print(f"{phase:<18} {getattr(result, phase):>10.1f}")
+    print(f"{'samples':<18} {result.samples:>10}")
+    if result.slowest_imports:
+        print()
+        print(f"{'package':<24} {'self ms':>10}")
+        print("-" * 35)
+        for name, ms in result.slowest_imports:
+            print(f"{name:<24} {ms:>10.1f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the API")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to sample")
+    parser.add_argument("--path", default="/health", help="route hit as the first request")
+    parser.add_argument("--profile", type=int, default=10, metavar="N",
+                        help="list the N slowest packages by import time (0 to skip)")
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-total-ms", type=float, default=None)
+    parser.add_argument("--json", action="store_true", help="emit results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    result = measure_startup(args.repeat, args.path, args.profile)
+
+    if args.json:
+        print(json.dumps(asdict(result), indent=2))
+    else:
+        _print_report(result)
+
+    failures = check_budget(result, args.max_import_ms, args.max_total_ms)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())